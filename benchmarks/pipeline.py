@@ -0,0 +1,335 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Benchmarks for the predict / weight / resample pipeline.
+
+    python -m robot_localization.benchmarks.pipeline --particles 1000 100000 --output bench.json
+
+Every benchmark draws its random numbers from --seed. The results are written
+as JSON together with the commit they were measured on, so runs can be compared.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from math import pi
+from pathlib import Path
+
+import numpy as np
+
+from robot_localization.filters import models
+from robot_localization.filters.batch_filter import BatchParticleFilter
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.filters.sharded_filter import ShardedParticleFilter
+from robot_localization.maps.likelihood_field import LikelihoodField
+from robot_localization.resampling import (MultinomialResampler, ResamplingWheel,
+                                           ResidualResampler, StratifiedResampler,
+                                           SystematicResampler)
+from robot_localization.robot import Robot
+
+WORLD_SIZE = 100.0
+NOISE = (0.05, 0.05, 5.0)
+TURN = 0.1
+FORWARD = 5.0
+
+
+def make_landmarks(count, seed):
+    """
+    Returns count landmarks spread over the world with a fixed seed
+    """
+    return np.random.default_rng(seed).random((count, 2)) * WORLD_SIZE
+
+
+def make_measurements(landmarks, steps, seed):
+    """
+    Simulates a robot for steps moves and returns its measurement at every step
+    """
+    rng = np.random.default_rng(seed)
+    x, y, orientation = rng.random((3, 1)) * [[WORLD_SIZE], [WORLD_SIZE], [2.0 * pi]]
+    measurements = []
+    for _ in range(steps):
+        models.move(x, y, orientation, TURN, FORWARD, NOISE[1], NOISE[0], WORLD_SIZE, rng)
+        distances = models.landmark_distances(x, y, landmarks)[0]
+        measurements.append(distances + rng.normal(0.0, NOISE[2], len(distances)))
+    return measurements
+
+
+def timed(function, steps):
+    """
+    Calls function(step) for every step and returns the elapsed seconds
+    """
+    start = time.perf_counter()
+    for step in range(steps):
+        function(step)
+    return time.perf_counter() - start
+
+
+def legacy_robots(count):
+    robots = []
+    for _ in range(count):
+        robot = Robot()
+        robot.set_noise(*NOISE)
+        robots.append(robot)
+    return robots
+
+
+def bench_robot_move(count, landmarks, measurements, steps, seed):
+    robots = legacy_robots(count)
+
+    def step(_):
+        robots[:] = [robot.move(TURN, FORWARD) for robot in robots]
+    return timed(step, steps)
+
+
+def bench_robot_measurement_prob(count, landmarks, measurements, steps, seed):
+    robots = legacy_robots(count)
+
+    def step(t):
+        return [robot.measurement_prob(measurements[t]) for robot in robots]
+    return timed(step, steps)
+
+
+def bench_resampling_wheel(count, landmarks, measurements, steps, seed):
+    weights = list(np.random.default_rng(seed).random(count))
+    wheel = ResamplingWheel()
+
+    def step(_):
+        wheel.set_wheel_data(weights)
+        return [wheel.get_pick_index() for _ in range(count)]
+    return timed(step, steps)
+
+
+def bench_models_move(count, landmarks, measurements, steps, seed):
+    rng = np.random.default_rng(seed)
+    particles = ParticleSet.uniform(count, WORLD_SIZE, rng)
+
+    def step(_):
+        models.move(particles.x, particles.y, particles.orientation, TURN, FORWARD,
+                    NOISE[1], NOISE[0], WORLD_SIZE, rng)
+    return timed(step, steps)
+
+
+def bench_models_log_likelihood(count, landmarks, measurements, steps, seed):
+    particles = ParticleSet.uniform(count, WORLD_SIZE, np.random.default_rng(seed))
+
+    def step(t):
+        return models.log_likelihood(particles.x, particles.y, landmarks, measurements[t],
+                                     NOISE[2])
+    return timed(step, steps)
+
+
+def bench_likelihood_field(count, landmarks, measurements, steps, seed):
+    particles = ParticleSet.uniform(count, WORLD_SIZE, np.random.default_rng(seed))
+    field = LikelihoodField(landmarks, WORLD_SIZE, 0.5)
+
+    def step(t):
+        return field.log_likelihood(particles.x, particles.y, measurements[t], NOISE[2])
+    return timed(step, steps)
+
+
+def bench_likelihood_field_nearest(count, landmarks, measurements, steps, seed):
+    particles = ParticleSet.uniform(count, WORLD_SIZE, np.random.default_rng(seed))
+    field = LikelihoodField(landmarks, WORLD_SIZE, 0.5)
+    field.build_distance_transform()
+
+    def step(t):
+        return field.nearest_log_likelihood(particles.x, particles.y, measurements[t].min(),
+                                            NOISE[2])
+    return timed(step, steps)
+
+
+def resampler_bench(resampler):
+    def bench(count, landmarks, measurements, steps, seed):
+        rng = np.random.default_rng(seed)
+        weights = rng.random(count)
+
+        def step(_):
+            return resampler.resample(weights, count, rng)
+        return timed(step, steps)
+    return bench
+
+
+def bench_particle_filter(count, landmarks, measurements, steps, seed):
+    pf = ParticleFilter(count, WORLD_SIZE, landmarks, rng=np.random.default_rng(seed))
+    pf.set_noise(*NOISE)
+
+    def step(t):
+        pf.filter(TURN, FORWARD, measurements[t])
+    return timed(step, steps)
+
+
+def bench_batch_filter(count, landmarks, measurements, steps, seed, robots=16):
+    batch = BatchParticleFilter(robots, max(count // robots, 1), WORLD_SIZE, landmarks,
+                                rng=np.random.default_rng(seed))
+    batch.set_noise(*NOISE)
+
+    def step(t):
+        batch.filter(TURN, FORWARD, [measurements[t]] * robots)
+    return timed(step, steps)
+
+
+def sharded_bench(workers):
+    def bench(count, landmarks, measurements, steps, seed):
+        with ShardedParticleFilter(count, workers, WORLD_SIZE, landmarks, seed=seed) as pf:
+            pf.set_noise(*NOISE)
+
+            def step(t):
+                pf.filter(TURN, FORWARD, measurements[t])
+            return timed(step, steps)
+    return bench
+
+
+LEGACY_BENCHMARKS = {
+    'robot.move': bench_robot_move,
+    'robot.measurement_prob': bench_robot_measurement_prob,
+    'resampling_wheel': bench_resampling_wheel,
+}
+
+BENCHMARKS = {
+    'models.move': bench_models_move,
+    'models.log_likelihood': bench_models_log_likelihood,
+    'likelihood_field.log_likelihood': bench_likelihood_field,
+    'likelihood_field.nearest': bench_likelihood_field_nearest,
+    'resample.multinomial': resampler_bench(MultinomialResampler()),
+    'resample.stratified': resampler_bench(StratifiedResampler()),
+    'resample.systematic': resampler_bench(SystematicResampler()),
+    'resample.residual': resampler_bench(ResidualResampler()),
+    'particle_filter.filter': bench_particle_filter,
+    'batch_filter.filter': bench_batch_filter,
+}
+
+
+def git_commit():
+    """
+    Returns the commit of the source tree, or None outside a git checkout
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(particle_counts, landmark_counts, steps, repeat=3, legacy_limit=10000, only=None,
+        seed=0, workers=0):
+    """
+    Runs the benchmarks and returns a list of result dicts.
+    Legacy per-object benchmarks are skipped above legacy_limit particles,
+    the sharded filter only runs when workers is given.
+    """
+    benchmarks = dict(LEGACY_BENCHMARKS)
+    benchmarks.update(BENCHMARKS)
+    if workers > 0:
+        benchmarks['sharded_filter.filter'] = sharded_bench(workers)
+    if only:
+        benchmarks = {name: bench for name, bench in benchmarks.items() if name in only}
+
+    results = []
+    for landmark_count in landmark_counts:
+        landmarks = make_landmarks(landmark_count, seed)
+        measurements = make_measurements(landmarks, steps, seed)
+        Robot.set_landmarks(landmarks.tolist())
+        for count in particle_counts:
+            for name, bench in benchmarks.items():
+                if name in LEGACY_BENCHMARKS and count > legacy_limit:
+                    continue
+                if name == 'sharded_filter.filter' and count < workers:
+                    continue
+                timings = []
+                for _ in range(repeat):
+                    random.seed(seed)
+                    timings.append(bench(count, landmarks, measurements, steps, seed))
+                results.append({
+                    'benchmark': name,
+                    'particles': count,
+                    'landmarks': landmark_count,
+                    'steps': steps,
+                    'best_seconds': min(timings),
+                    'seconds_per_step': min(timings) / steps,
+                    'timings': timings,
+                })
+                print('%-32s N=%-8d M=%-5d %.6f s/step' % (name, count, landmark_count,
+                                                            min(timings) / steps))
+    return results
+
+
+def compare(results, baseline):
+    """
+    Prints the per step time of every result relative to a baseline report
+    """
+    previous = {(r['benchmark'], r['particles'], r['landmarks']): r['seconds_per_step']
+                for r in baseline['results']}
+    print('\ncompared to commit %s:' % baseline.get('commit'))
+    for result in results:
+        key = (result['benchmark'], result['particles'], result['landmarks'])
+        if key in previous:
+            print('%-32s N=%-8d M=%-5d %6.2fx' % (key + (result['seconds_per_step'] / previous[key],)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Times the predict / weight / resample pipeline.')
+    parser.add_argument('--particles', type=int, nargs='+',
+                        default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--landmarks', type=int, nargs='+', default=[4, 64])
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--legacy-limit', type=int, default=10000,
+                        help='largest particle count for the per-object Robot benchmarks')
+    parser.add_argument('--only', nargs='+')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=0,
+                        help='worker processes for the sharded filter, 0 skips it')
+    parser.add_argument('--output', type=Path, help='JSON file to write the results to')
+    parser.add_argument('--compare', type=Path, help='JSON report of an earlier run')
+    args = parser.parse_args(argv)
+
+    saved_landmarks = Robot.landmarks
+    try:
+        results = run(args.particles, args.landmarks, args.steps, args.repeat,
+                      args.legacy_limit, args.only, args.seed, args.workers)
+    finally:
+        Robot.set_landmarks(saved_landmarks)
+
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.compare is not None:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == '__main__':
+    main()
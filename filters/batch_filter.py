@@ -0,0 +1,192 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Batched particle filters for localizing many robots in one vectorized pass
+"""
+from math import pi
+
+import numpy as np
+
+from robot_localization.filters import models
+from robot_localization.filters.filter import Filter
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.robot import Robot
+from robot_localization.utils.rng import make_rng
+
+
+def _pad(rows, width=None):
+    """
+    Packs rows of different lengths into a zero padded 2-dim array and
+    returns it with the mask of the valid entries
+    """
+    rows = [np.asarray(row, dtype=np.float64) for row in rows]
+    if width is None:
+        width = max(len(row) for row in rows)
+    packed = np.zeros((len(rows), width) + rows[0].shape[1:])
+    mask = np.zeros((len(rows), width), dtype=bool)
+    for i, row in enumerate(rows):
+        packed[i, :len(row)] = row
+        mask[i, :len(row)] = True
+    return packed, mask
+
+
+class BatchParticleFilter(Filter):
+    """
+    Runs K independent particle filters with N particles each.
+    Poses and weights live in (K, N) arrays, and every robot has its own
+    world size, landmark map and noise parameters, so there is no shared
+    class level state. A single call advances all K filters.
+    """
+
+    def __init__(self, robot_count, particle_count=1000, world_size=None, landmarks=None,
+                 rng=None, ess_threshold=0.5):
+        super().__init__()
+        if robot_count <= 0 or particle_count <= 0:
+            raise ValueError("Robot and particle counts must be greater than 0.")
+        if world_size is None:
+            world_size = Robot.world_size
+        if landmarks is None:
+            landmarks = Robot.landmarks
+
+        self.robot_count = robot_count
+        self.particle_count = particle_count
+        self.rng = make_rng(rng)
+        self.ess_threshold = ess_threshold
+        self.world_size = np.broadcast_to(
+            np.asarray(world_size, dtype=np.float64), (robot_count,)).copy()
+        self.set_landmarks(landmarks)
+        self.forward_noise = np.zeros(robot_count)
+        self.turn_noise = np.zeros(robot_count)
+        self.sense_noise = np.zeros(robot_count)
+
+        shape = (robot_count, particle_count)
+        samples = self.rng.random((3,) + shape)
+        samples[:2] *= self.world_size[:, np.newaxis]
+        samples[2] *= 2.0 * pi
+        self.x, self.y, self.orientation = samples
+        self.weights = np.full(shape, 1.0 / particle_count)
+        self.ess = np.full(robot_count, float(particle_count))
+
+    def set_landmarks(self, landmarks):
+        """
+        Sets the landmarks, either one list shared by every robot or
+        one list of landmarks per robot
+        """
+        landmarks = [np.asarray(row, dtype=np.float64) for row in landmarks]
+        if all(row.ndim == 1 for row in landmarks):
+            landmarks = [np.array(landmarks)] * self.robot_count
+        if len(landmarks) != self.robot_count:
+            raise ValueError("Landmarks are needed for every robot.")
+        self.landmarks, self.landmark_mask = _pad(landmarks)
+
+    def set_noise(self, new_f_noise, new_t_noise, new_s_noise):
+        """
+        Sets the noise parameters, scalars are shared by every robot
+        """
+        shape = (self.robot_count,)
+        self.forward_noise = np.broadcast_to(np.asarray(new_f_noise, dtype=np.float64), shape).copy()
+        self.turn_noise = np.broadcast_to(np.asarray(new_t_noise, dtype=np.float64), shape).copy()
+        self.sense_noise = np.broadcast_to(np.asarray(new_s_noise, dtype=np.float64), shape).copy()
+
+    def get_particles(self, robot) -> ParticleSet:
+        """
+        Returns a copy of the particles of one robot as a ParticleSet
+        """
+        return ParticleSet(self.x[robot].copy(), self.y[robot].copy(),
+                           self.orientation[robot].copy(), self.weights[robot].copy())
+
+    def move_particles(self, turns, forwards):
+        """
+        Moves the particles of every robot with its own command
+        """
+        turns = np.broadcast_to(np.asarray(turns, dtype=np.float64), (self.robot_count,))
+        forwards = np.broadcast_to(np.asarray(forwards, dtype=np.float64), (self.robot_count,))
+        column = np.s_[:, np.newaxis]
+        models.move(self.x, self.y, self.orientation, turns[column], forwards[column],
+                    self.turn_noise[column], self.forward_noise[column],
+                    self.world_size[column], self.rng)
+
+    def extract_weights(self, measurements):
+        """
+        Weights every particle of every robot against the measured distances.
+        measurements is a list with one distance list per robot, in the order
+        of that robot's landmarks. Returns the normalized (K, N) log weights.
+        """
+        if np.any(self.sense_noise <= 0):
+            raise ValueError('Sense noise must be greater than 0.')
+        measurements, _ = _pad(measurements, self.landmarks.shape[1])
+
+        error = np.hypot(self.x[:, :, np.newaxis] - self.landmarks[:, np.newaxis, :, 0],
+                         self.y[:, :, np.newaxis] - self.landmarks[:, np.newaxis, :, 1])
+        error -= measurements[:, np.newaxis, :]
+        error *= error
+        error *= self.landmark_mask[:, np.newaxis, :]
+        log_weights = error.sum(axis=-1)
+        log_weights *= (-0.5 / self.sense_noise ** 2)[:, np.newaxis]
+
+        with np.errstate(divide='ignore'):
+            log_weights += np.log(self.weights)
+        models.log_normalize(log_weights)
+        np.exp(log_weights, out=self.weights)
+        self.ess = models.effective_sample_size(self.weights)
+        return log_weights
+
+    def resample(self, robots=None):
+        """
+        Systematic resampling of the given robots' filters in one batched
+        searchsorted call. Resamples every filter if robots is None.
+        """
+        if robots is None:
+            robots = np.arange(self.robot_count)
+        robots = np.asarray(robots, dtype=np.intp)
+        if len(robots) == 0:
+            return
+        count = self.particle_count
+        rows = np.arange(len(robots))[:, np.newaxis]
+
+        cumulative = np.cumsum(self.weights[robots], axis=1)
+        cumulative /= cumulative[:, -1:]
+        cumulative[:, -1] = 1.0
+        cumulative += rows
+        positions = np.arange(count) + self.rng.random((len(robots), 1))
+        positions /= count
+        positions += rows
+
+        indices = np.searchsorted(cumulative.ravel(), positions.ravel(), side='right')
+        indices = indices.reshape(len(robots), count) - rows * count
+        np.clip(indices, 0, count - 1, out=indices)
+
+        for values in (self.x, self.y, self.orientation):
+            values[robots] = np.take_along_axis(values[robots], indices, axis=1)
+        self.weights[robots] = 1.0 / count
+        self.ess[robots] = count
+
+    def filter(self, turns, forwards, measurements):
+        """
+        Runs one predict, weight and resample cycle for every robot.
+        Only the filters whose effective sample size dropped below the
+        threshold are resampled.
+        """
+        self.move_particles(turns, forwards)
+        self.extract_weights(measurements)
+        self.resample(np.flatnonzero(self.ess < self.ess_threshold * self.particle_count))
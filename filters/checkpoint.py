@@ -0,0 +1,239 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Checkpoint / restore of ParticleFilter state and deterministic replay
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from robot_localization import resampling
+from robot_localization.filters.kld import KLDSampler
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.maps.free_space import FreeSpaceSampler
+from robot_localization.maps.landmark_map import LandmarkMap
+from robot_localization.maps.likelihood_field import LikelihoodField
+from robot_localization.planning.grid import OccupancyGrid
+
+
+def _settings(particle_filter):
+    """
+    Returns the configuration that changes the computed weights as a JSON dict
+    """
+    kld = particle_filter.kld
+    field = particle_filter.likelihood_field
+    free_space = particle_filter.free_space
+    return {
+        'sensor_range': particle_filter.landmark_map.sensor_range,
+        'cell_size': particle_filter.landmark_map.cell_size,
+        'resampler': type(particle_filter.resampler).__name__,
+        'kld': None if kld is None else {
+            'min_count': kld.min_count, 'max_count': kld.max_count, 'epsilon': kld.epsilon,
+            'delta': kld.delta, 'bin_size': list(kld.bin_size)},
+        'likelihood_field': None if field is None else {'resolution': field.resolution},
+        'fast_math': particle_filter.fast_math,
+        'free_space': None if free_space is None else {'cell_size': free_space.cell_size},
+    }
+
+
+def _restored_filter(settings, particle_count, world_size, landmarks, rng, blocked=None):
+    """
+    Creates a ParticleFilter with the configuration saved by _settings,
+    blocked is the occupancy of the free space sampler's grid
+    """
+    resampler = getattr(resampling, settings['resampler'], None)
+    if not (isinstance(resampler, type) and issubclass(resampler, resampling.Resampler)):
+        raise ValueError('Resampler %s can not be restored, pass a filter using it.'
+                         % settings['resampler'])
+    kld = settings['kld']
+    field = settings['likelihood_field']
+    free_space = settings.get('free_space')
+    return ParticleFilter(
+        particle_count, world_size,
+        LandmarkMap(landmarks, settings['sensor_range'], settings['cell_size']), rng,
+        resampler=resampler(),
+        kld=None if kld is None else KLDSampler(**kld),
+        likelihood_field=None if field is None else LikelihoodField(
+            landmarks, world_size, field['resolution']),
+        fast_math=settings['fast_math'],
+        free_space=None if free_space is None else FreeSpaceSampler(
+            OccupancyGrid.from_rows(blocked), free_space['cell_size']))
+
+
+def save_checkpoint(particle_filter: ParticleFilter, path):
+    """
+    Saves particles, weights, RNG state, step counter, the augmented MCL
+    likelihood averages and the filter configuration to an .npz file.
+    The file is written next to path, synced and then renamed onto it, so a
+    crash while saving leaves the previous checkpoint intact.
+    """
+    particles = particle_filter.particles
+    arrays = {}
+    if particle_filter.free_space is not None:
+        sampler = particle_filter.free_space
+        arrays['blocked'] = (~sampler.free).reshape(sampler.rows, sampler.cols).astype(np.uint8)
+    state = {
+        'step_count': particle_filter.step_count,
+        'rng': particle_filter.rng.bit_generator.state,
+        'noise': [particle_filter.forward_noise, particle_filter.turn_noise,
+                  particle_filter.sense_noise],
+        'ess': particle_filter.ess,
+        'ess_threshold': particle_filter.ess_threshold,
+        'world_size': particle_filter.world_size,
+        'alpha_slow': particle_filter.alpha_slow,
+        'alpha_fast': particle_filter.alpha_fast,
+        'log_w_slow': particle_filter.log_w_slow,
+        'log_w_fast': particle_filter.log_w_fast,
+        'settings': _settings(particle_filter),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary = tempfile.mkstemp(suffix='.npz.tmp', dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as checkpoint:
+            np.savez(checkpoint, x=particles.x, y=particles.y, orientation=particles.orientation,
+                     weights=particles.weights, landmarks=particle_filter.landmarks,
+                     state=np.array(json.dumps(state)), **arrays)
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def load_checkpoint(path, particle_filter: ParticleFilter = None) -> ParticleFilter:
+    """
+    Restores a checkpoint saved by save_checkpoint. Without particle_filter
+    a new ParticleFilter is created with the saved landmark map, resampler,
+    KLD, likelihood field, fast-math and free space settings. If particle_filter
+    is given its state is overwritten and its own settings are kept, a ValueError
+    is raised if it lacks a KLD sampler, likelihood field or free space sampler
+    the checkpoint used.
+    """
+    with np.load(path, allow_pickle=False) as checkpoint:
+        state = json.loads(str(checkpoint['state']))
+        particles = ParticleSet(checkpoint['x'], checkpoint['y'], checkpoint['orientation'],
+                                checkpoint['weights'])
+        landmarks = checkpoint['landmarks']
+        blocked = checkpoint['blocked'] if 'blocked' in checkpoint else None
+
+    rng = np.random.default_rng()
+    if state['rng']['bit_generator'] != type(rng.bit_generator).__name__:
+        rng = np.random.Generator(getattr(np.random, state['rng']['bit_generator'])())
+
+    # checkpoints written before the settings were saved used the defaults
+    settings = state.get('settings')
+    if particle_filter is None:
+        if settings is None:
+            particle_filter = ParticleFilter(len(particles), state['world_size'], landmarks, rng)
+        else:
+            particle_filter = _restored_filter(settings, len(particles), state['world_size'],
+                                               landmarks, rng, blocked)
+    elif settings is not None:
+        for name in ('kld', 'likelihood_field', 'free_space'):
+            if settings.get(name) is not None and getattr(particle_filter, name) is None:
+                raise ValueError('The checkpoint was saved with a %s, the filter has none.' % name)
+    # the constructor draws the initial particles, so the state is restored afterwards
+    rng.bit_generator.state = state['rng']
+    particle_filter.rng = rng
+    particle_filter.set_particles(particles)
+    particle_filter.set_noise(*state['noise'])
+    particle_filter.ess = state['ess']
+    particle_filter.ess_threshold = state['ess_threshold']
+    particle_filter.step_count = state['step_count']
+    # checkpoints written before augmented MCL existed have no averages
+    particle_filter.alpha_slow = state.get('alpha_slow', 0.0)
+    particle_filter.alpha_fast = state.get('alpha_fast', 0.0)
+    particle_filter.log_w_slow = state.get('log_w_slow', -np.inf)
+    particle_filter.log_w_fast = state.get('log_w_fast', -np.inf)
+    return particle_filter
+
+
+class ReplayLog(object):
+    """
+    Append-only JSON lines log of the inputs given to ParticleFilter.filter.
+    Set it as particle_filter.replay_log to record a run, and close it or use
+    it as a context manager. Every line is flushed when written, so the log
+    survives a crash of the process up to the last step. With sync=True every
+    line is also fsynced, which makes it survive a power loss too.
+    """
+
+    def __init__(self, path, sync=False):
+        self.path = path
+        self.sync = sync
+        self.file = open(path, 'a')
+
+    def record(self, step, turn, forward, measurement, landmark_ids=None):
+        """
+        Appends the inputs of one filter step
+        """
+        entry = {
+            'step': step,
+            'turn': float(turn),
+            'forward': float(forward),
+            'measurement': np.asarray(measurement, dtype=np.float64).tolist(),
+            'landmark_ids': None if landmark_ids is None else np.asarray(landmark_ids).tolist(),
+        }
+        self.file.write(json.dumps(entry) + '\n')
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def read(path):
+        """
+        Yields the recorded entries as dicts
+        """
+        with open(path) as log:
+            for line in log:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def replay(particle_filter: ParticleFilter, path):
+    """
+    Applies every recorded step the filter hasn't seen yet, that is every
+    entry with step >= particle_filter.step_count. Restoring a checkpoint and
+    replaying the log reproduces the recorded run bit for bit. Works for any
+    filter with step_count and filter(), e.g. a HybridLocalizer.
+    """
+    for entry in ReplayLog.read(path):
+        if entry['step'] < particle_filter.step_count:
+            continue
+        if entry['step'] != particle_filter.step_count:
+            raise ValueError('Replay log is missing step %d' % particle_filter.step_count)
+        particle_filter.filter(entry['turn'], entry['forward'], entry['measurement'],
+                               entry['landmark_ids'])
+    return particle_filter
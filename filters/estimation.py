@@ -0,0 +1,104 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Pose estimators working directly on particle arrays
+"""
+from math import pi
+
+import numpy as np
+
+
+def circular_mean(angles, weights, period=2.0 * pi):
+    """
+    Returns the weighted mean of values that wrap around at period,
+    in [0, period)
+    """
+    scale = 2.0 * pi / period
+    mean = np.arctan2(np.dot(weights, np.sin(angles * scale)),
+                      np.dot(weights, np.cos(angles * scale))) / scale
+    return float(mean % period)
+
+
+def wrap(values, period):
+    """
+    Wraps values into [-period / 2, period / 2)
+    """
+    return (values + period / 2.0) % period - period / 2.0
+
+
+def weighted_mean(x, y, orientation, weights, world_size=None):
+    """
+    Returns the weighted mean pose (x, y, orientation) of the particles.
+    Orientation is averaged on the unit circle. If world_size is given the
+    positions are averaged as cyclic values too, so a cloud that wraps
+    around the world border is not pulled to the middle of the world.
+    """
+    weights = weights / weights.sum()
+    if world_size is None:
+        mean_x, mean_y = float(np.dot(weights, x)), float(np.dot(weights, y))
+    else:
+        mean_x = circular_mean(x, weights, world_size)
+        mean_y = circular_mean(y, weights, world_size)
+    return mean_x, mean_y, circular_mean(orientation, weights)
+
+
+def covariance(x, y, orientation, weights, mean=None, world_size=None):
+    """
+    Returns the 3x3 weighted covariance of (x, y, orientation) around mean.
+    Residuals are wrapped, orientation always and positions if world_size is given.
+    """
+    weights = weights / weights.sum()
+    if mean is None:
+        mean = weighted_mean(x, y, orientation, weights, world_size)
+    residuals = np.empty((3, len(x)))
+    np.subtract(x, mean[0], out=residuals[0])
+    np.subtract(y, mean[1], out=residuals[1])
+    np.subtract(orientation, mean[2], out=residuals[2])
+    if world_size is not None:
+        residuals[:2] = wrap(residuals[:2], world_size)
+    residuals[2] = wrap(residuals[2], 2.0 * pi)
+    return (residuals * weights) @ residuals.T
+
+
+def mode(x, y, orientation, weights, world_size, bin_size=1.0):
+    """
+    Returns the MAP estimate as the weighted mean pose of the particles in the
+    heaviest (x, y) histogram bin. Binning is a single bincount, O(N).
+    """
+    bins = int(np.ceil(world_size / bin_size))
+    i_x = np.clip((x // bin_size).astype(np.intp), 0, bins - 1)
+    i_y = np.clip((y // bin_size).astype(np.intp), 0, bins - 1)
+    cells = i_x * bins + i_y
+    best = np.argmax(np.bincount(cells, weights=weights, minlength=bins * bins))
+    inside = cells == best
+    return weighted_mean(x[inside], y[inside], orientation[inside], weights[inside], world_size)
+
+
+def wrapped_error(x, y, true_x, true_y, world_size, weights=None):
+    """
+    Returns the mean distance of the particles to (true_x, true_y)
+    measured in the cyclic world, the vectorized form of robot.eval
+    """
+    d_x = wrap(x - true_x, world_size)
+    d_y = wrap(y - true_y, world_size)
+    return float(np.average(np.hypot(d_x, d_y), weights=weights))
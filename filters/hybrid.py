@@ -0,0 +1,152 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Hybrid localization: a particle filter for global localization that hands
+off to a Kalman tracker once converged and takes over again when the
+robot gets lost
+"""
+import numpy as np
+
+from robot_localization.filters import estimation, models
+from robot_localization.filters.filter import Filter
+from robot_localization.filters.kalman import ExtendedKalmanFilter
+from robot_localization.filters.particle_filter import ParticleFilter
+
+GLOBAL = 'global'
+TRACKING = 'tracking'
+
+
+class HybridLocalizer(Filter):
+    """
+    Supervises a ParticleFilter and a Kalman tracker.
+    In GLOBAL mode the particle filter runs until its cloud is tight
+    (position std below converge_std) and unimodal (mode and mean closer than
+    converge_std). The cloud is then collapsed to its mean and covariance and
+    the tracker takes over. In TRACKING mode the RMS measurement residual at
+    the predicted mean is watched; after lost_patience steps above
+    lost_sigma * sense_noise the particles are re-inflated around the last
+    estimate (plus a uniform share for a kidnapped robot) and GLOBAL mode resumes.
+    """
+
+    def __init__(self, particle_filter: ParticleFilter, tracker_class=ExtendedKalmanFilter,
+                 converge_std=1.0, lost_sigma=3.0, lost_patience=3, inflation=25.0,
+                 uniform_fraction=0.1, recovery_count=None):
+        super().__init__()
+        self.particle_filter = particle_filter
+        self.tracker_class = tracker_class
+        self.tracker = None
+        self.mode = GLOBAL
+        self.converge_std = converge_std
+        self.lost_sigma = lost_sigma
+        self.lost_patience = lost_patience
+        self.inflation = inflation
+        self.uniform_fraction = uniform_fraction
+        self.recovery_count = recovery_count or particle_filter.particle_count
+        self.lost_steps = 0
+        self.step_count = 0
+        self.replay_log = None
+
+    def is_converged(self):
+        """
+        Returns True if the particle cloud is tight and unimodal
+        """
+        pf = self.particle_filter
+        particles = pf.particles
+        cov = pf.covariance()
+        if np.sqrt(np.linalg.eigvalsh(cov[:2, :2])[-1]) > self.converge_std:
+            return False
+        mean = pf.estimate()
+        mode = estimation.mode(particles.x, particles.y, particles.orientation,
+                               particles.weights, pf.world_size, self.converge_std)
+        offset = estimation.wrap(np.subtract(mode[:2], mean[:2]), pf.world_size)
+        return np.hypot(*offset) < self.converge_std
+
+    def _hand_off(self):
+        pf = self.particle_filter
+        self.tracker = self.tracker_class(pf.estimate(), pf.covariance(), pf.world_size,
+                                          pf.landmarks)
+        self.tracker.set_noise(pf.forward_noise, pf.turn_noise, pf.sense_noise)
+        self.mode = TRACKING
+        self.lost_steps = 0
+
+    def _recover(self):
+        pf = self.particle_filter
+        pf.reseed(self.tracker.mean, self.tracker.covariance() * self.inflation,
+                  self.recovery_count, self.uniform_fraction)
+        self.tracker = None
+        self.mode = GLOBAL
+
+    def _residual(self, measurement, landmark_ids):
+        landmarks = self.tracker.landmarks
+        if landmark_ids is not None:
+            landmarks = landmarks[landmark_ids]
+        expected = models.landmark_distances(self.tracker.mean[0], self.tracker.mean[1], landmarks)
+        return np.sqrt(np.mean((np.asarray(measurement) - expected) ** 2))
+
+    def filter(self, turn, forward, measurement, landmark_ids=None):
+        """
+        Runs one cycle on the active backend and switches backends if needed.
+        Returns the pose estimate. Every step, in either mode, is recorded to
+        replay_log, so checkpoint.replay(hybrid, path) can rerun a hybrid run.
+        Set the log here rather than on the particle filter.
+        """
+        if self.replay_log is not None:
+            self.replay_log.record(self.step_count, turn, forward, measurement, landmark_ids)
+        estimate = self._step(turn, forward, measurement, landmark_ids)
+        self.step_count += 1
+        return estimate
+
+    def _step(self, turn, forward, measurement, landmark_ids):
+        if self.mode == GLOBAL:
+            self.particle_filter.filter(turn, forward, measurement, landmark_ids)
+            if self.is_converged():
+                self._hand_off()
+            return self.estimate()
+
+        self.tracker.predict(turn, forward)
+        if self._residual(measurement, landmark_ids) > self.lost_sigma * self.tracker.sense_noise:
+            self.lost_steps += 1
+            if self.lost_steps >= self.lost_patience:
+                self._recover()
+                self.particle_filter.update(measurement, landmark_ids)
+                return self.estimate()
+        else:
+            self.lost_steps = 0
+        self.tracker.update(measurement, landmark_ids)
+        return self.estimate()
+
+    def estimate(self):
+        """
+        Returns the pose estimate of the active backend
+        """
+        if self.mode == TRACKING:
+            return self.tracker.estimate()
+        return self.particle_filter.estimate()
+
+    def covariance(self):
+        """
+        Returns the covariance of the active backend
+        """
+        if self.mode == TRACKING:
+            return self.tracker.covariance()
+        return self.particle_filter.covariance()
@@ -0,0 +1,250 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Extended and unscented Kalman filter localizers.
+Both use the Robot.move motion model (turn, then forward, cyclic world)
+and the Robot.sense range model, and share the predict / update API of
+ParticleFilter so the backends can be swapped.
+"""
+from math import pi
+
+import numpy as np
+
+from robot_localization.filters import estimation, models
+from robot_localization.filters.filter import Filter
+from robot_localization.robot import Robot
+
+
+def _motion(x, y, orientation, turn, forward):
+    """
+    Noise free Robot.move for arrays of poses, positions are not wrapped
+    """
+    orientation = orientation + turn
+    return x + np.cos(orientation) * forward, y + np.sin(orientation) * forward, orientation
+
+
+class GaussianFilter(Filter):
+    """
+    Base of the Kalman localizers. The belief is a gaussian over
+    (x, y, orientation) held in mean and cov.
+    """
+
+    def __init__(self, mean, cov, world_size=None, landmarks=None):
+        super().__init__()
+        if world_size is None:
+            world_size = Robot.world_size
+        if landmarks is None:
+            landmarks = Robot.landmarks
+        self.world_size = float(world_size)
+        self.landmarks = np.array(landmarks, dtype=np.float64).reshape(-1, 2)
+        self.mean = np.array(mean, dtype=np.float64)
+        self.cov = np.array(cov, dtype=np.float64)
+        if self.mean.shape != (3,) or self.cov.shape != (3, 3):
+            raise ValueError("Mean must have 3 and covariance 3x3 entries.")
+        self.forward_noise = 0.0
+        self.turn_noise = 0.0
+        self.sense_noise = 0.0
+
+    def set_noise(self, new_f_noise, new_t_noise, new_s_noise):
+        """
+        Sets the noise parameters, same meaning as Robot.set_noise
+        """
+        self.forward_noise = float(new_f_noise)
+        self.turn_noise = float(new_t_noise)
+        self.sense_noise = float(new_s_noise)
+
+    def _wrap_mean(self):
+        self.mean[0] %= self.world_size
+        self.mean[1] %= self.world_size
+        self.mean[2] %= 2.0 * pi
+
+    def _measurement_noise(self, size):
+        if self.sense_noise <= 0:
+            raise ValueError('Sense noise must be greater than 0.')
+        return np.eye(size) * self.sense_noise ** 2
+
+    def _observed(self, measurement, landmark_ids):
+        """
+        Returns the observed landmarks and the measurement as an array,
+        raises ValueError if they don't match up
+        """
+        landmarks = self.landmarks if landmark_ids is None else self.landmarks[landmark_ids]
+        measurement = np.asarray(measurement, dtype=np.float64)
+        if measurement.shape != (len(landmarks),):
+            raise ValueError('Expected one measurement per landmark.')
+        return landmarks, measurement
+
+    def estimate(self):
+        """
+        Returns the mean pose (x, y, orientation)
+        """
+        return tuple(self.mean.tolist())
+
+    def covariance(self):
+        """
+        Returns the 3x3 covariance of the pose
+        """
+        return self.cov.copy()
+
+    def predict(self, turn, forward):
+        raise NotImplementedError
+
+    def update(self, measurement, landmark_ids=None):
+        raise NotImplementedError
+
+    def filter(self, turn, forward, measurement, landmark_ids=None):
+        """
+        Runs one predict and update cycle and returns the mean pose
+        """
+        self.predict(turn, forward)
+        self.update(measurement, landmark_ids)
+        return self.estimate()
+
+
+class ExtendedKalmanFilter(GaussianFilter):
+    """
+    EKF localizer, linearizes the motion and range models around the mean
+    """
+
+    def predict(self, turn, forward):
+        """
+        Propagates the belief through the motion model
+        """
+        if forward < 0:
+            raise ValueError('Robot cant move backwards')
+        x, y, orientation = _motion(*self.mean, turn, forward)
+        cos_t, sin_t = np.cos(orientation), np.sin(orientation)
+        state_jacobian = np.array([[1.0, 0.0, -sin_t * forward],
+                                   [0.0, 1.0, cos_t * forward],
+                                   [0.0, 0.0, 1.0]])
+        noise_jacobian = np.array([[-sin_t * forward, cos_t],
+                                   [cos_t * forward, sin_t],
+                                   [1.0, 0.0]])
+        noise = np.diag([self.turn_noise ** 2, self.forward_noise ** 2])
+        self.mean = np.array([x, y, orientation])
+        self.cov = (state_jacobian @ self.cov @ state_jacobian.T
+                    + noise_jacobian @ noise @ noise_jacobian.T)
+        self._wrap_mean()
+
+    def update(self, measurement, landmark_ids=None):
+        """
+        Corrects the belief with the measured landmark distances
+        """
+        landmarks, measurement = self._observed(measurement, landmark_ids)
+        offsets = self.mean[:2] - landmarks
+        expected = np.hypot(offsets[:, 0], offsets[:, 1])
+        jacobian = np.zeros((len(landmarks), 3))
+        jacobian[:, :2] = offsets / np.maximum(expected, 1e-9)[:, np.newaxis]
+
+        innovation_cov = jacobian @ self.cov @ jacobian.T + self._measurement_noise(len(landmarks))
+        gain = np.linalg.solve(innovation_cov, jacobian @ self.cov).T
+        self.mean = self.mean + gain @ (measurement - expected)
+        # Joseph form keeps the covariance symmetric and positive definite
+        correction = np.eye(3) - gain @ jacobian
+        self.cov = (correction @ self.cov @ correction.T
+                    + gain @ self._measurement_noise(len(landmarks)) @ gain.T)
+        self._wrap_mean()
+
+
+class UnscentedKalmanFilter(GaussianFilter):
+    """
+    UKF localizer, propagates scaled sigma points through the models.
+    The motion noise is part of the sigma points (augmented state).
+    """
+
+    def __init__(self, mean, cov, world_size=None, landmarks=None, alpha=1.0, beta=2.0,
+                 kappa=0.0):
+        super().__init__(mean, cov, world_size, landmarks)
+        self.alpha = alpha
+        self.beta = beta
+        self.kappa = kappa
+
+    def _sigma_points(self, mean, cov):
+        size = len(mean)
+        spread = self.alpha ** 2 * (size + self.kappa) - size
+        root = np.linalg.cholesky((size + spread) * cov)
+        points = np.tile(mean, (2 * size + 1, 1))
+        points[1:size + 1] += root.T
+        points[size + 1:] -= root.T
+        mean_weights = np.full(2 * size + 1, 0.5 / (size + spread))
+        mean_weights[0] = spread / (size + spread)
+        cov_weights = mean_weights.copy()
+        cov_weights[0] += 1.0 - self.alpha ** 2 + self.beta
+        return points, mean_weights, cov_weights
+
+    def _pose_mean(self, points, weights, reference):
+        """
+        Weighted mean of pose sigma points, positions are averaged relative
+        to the reference so the cyclic world border doesn't split them
+        """
+        offsets = estimation.wrap(points[:, :2] - reference[:2], self.world_size)
+        orientation = np.arctan2(weights @ np.sin(points[:, 2]), weights @ np.cos(points[:, 2]))
+        return np.append(reference[:2] + weights @ offsets, orientation)
+
+    def _pose_residuals(self, points, mean):
+        residuals = points[:, :3] - mean
+        residuals[:, :2] = estimation.wrap(residuals[:, :2], self.world_size)
+        residuals[:, 2] = estimation.wrap(residuals[:, 2], 2.0 * pi)
+        return residuals
+
+    def predict(self, turn, forward):
+        """
+        Propagates the belief through the motion model
+        """
+        if forward < 0:
+            raise ValueError('Robot cant move backwards')
+        mean = np.append(self.mean, [0.0, 0.0])
+        cov = np.zeros((5, 5))
+        cov[:3, :3] = self.cov
+        cov[3, 3] = max(self.turn_noise ** 2, 1e-12)
+        cov[4, 4] = max(self.forward_noise ** 2, 1e-12)
+        points, mean_weights, cov_weights = self._sigma_points(mean, cov)
+
+        moved = np.column_stack(_motion(points[:, 0], points[:, 1], points[:, 2],
+                                        turn + points[:, 3], forward + points[:, 4]))
+        reference = np.array(_motion(*self.mean, turn, forward))
+        self.mean = self._pose_mean(moved, mean_weights, reference)
+        residuals = self._pose_residuals(moved, self.mean)
+        self.cov = (residuals * cov_weights[:, np.newaxis]).T @ residuals
+        self._wrap_mean()
+
+    def update(self, measurement, landmark_ids=None):
+        """
+        Corrects the belief with the measured landmark distances
+        """
+        landmarks, measurement = self._observed(measurement, landmark_ids)
+        points, mean_weights, cov_weights = self._sigma_points(self.mean, self.cov)
+        expected = models.landmark_distances(points[:, 0] % self.world_size,
+                                             points[:, 1] % self.world_size, landmarks)
+        expected_mean = mean_weights @ expected
+
+        measurement_residuals = expected - expected_mean
+        pose_residuals = self._pose_residuals(points, self.mean)
+        weighted = measurement_residuals * cov_weights[:, np.newaxis]
+        innovation_cov = weighted.T @ measurement_residuals + self._measurement_noise(len(landmarks))
+        cross_cov = (pose_residuals * cov_weights[:, np.newaxis]).T @ measurement_residuals
+
+        gain = np.linalg.solve(innovation_cov, cross_cov.T).T
+        self.mean = self.mean + gain @ (measurement - expected_mean)
+        self.cov = self.cov - gain @ innovation_cov @ gain.T
+        self._wrap_mean()
@@ -0,0 +1,104 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+KLD-sampling, adapts the particle count to how spread the posterior is
+"""
+from math import pi
+from statistics import NormalDist
+
+import numpy as np
+
+from robot_localization.resampling import MultinomialResampler
+
+
+def kld_sample_size(bins, epsilon=0.05, delta=0.01):
+    """
+    Returns the number of samples needed so that, with probability 1 - delta,
+    the KL distance between the sample based estimate and the true posterior
+    stays below epsilon when the posterior occupies the given number of bins.
+    Works on arrays of bin counts as well.
+    """
+    bins = np.asarray(bins, dtype=np.float64)
+    z_score = NormalDist().inv_cdf(1.0 - delta)
+    k = np.maximum(bins - 1.0, 1.0)
+    term = 2.0 / (9.0 * k)
+    size = np.ceil(k / (2.0 * epsilon) * (1.0 - term + np.sqrt(term) * z_score) ** 3)
+    return np.where(bins > 1, size, 1.0)
+
+
+class KLDSampler(object):
+    """
+    Draws a new generation of particles whose size follows KLD-sampling.
+    Particles are drawn from the weights until their count exceeds the bound
+    for the number of (x, y, orientation) histogram bins they occupy,
+    clamped to [min_count, max_count].
+    """
+
+    def __init__(self, min_count=100, max_count=100000, epsilon=0.05, delta=0.01,
+                 bin_size=(1.0, 1.0, pi / 18.0)):
+        if min_count <= 0 or max_count < min_count:
+            raise ValueError("Particle counts must satisfy 0 < min_count <= max_count.")
+        self.min_count = int(min_count)
+        self.max_count = int(max_count)
+        self.epsilon = epsilon
+        self.delta = delta
+        self.bin_size = tuple(float(size) for size in bin_size)
+        self.resampler = MultinomialResampler()
+
+    def bin_ids(self, x, y, orientation, world_size):
+        """
+        Returns a single integer histogram bin id for every pose
+        """
+        x_bins = int(np.ceil(world_size / self.bin_size[0]))
+        y_bins = int(np.ceil(world_size / self.bin_size[1]))
+        t_bins = int(np.ceil(2.0 * pi / self.bin_size[2]))
+        i_x = np.clip((x // self.bin_size[0]).astype(np.int64), 0, x_bins - 1)
+        i_y = np.clip((y // self.bin_size[1]).astype(np.int64), 0, y_bins - 1)
+        i_t = np.clip((orientation // self.bin_size[2]).astype(np.int64), 0, t_bins - 1)
+        return (i_x * y_bins + i_y) * t_bins + i_t
+
+    def sample(self, particles, world_size, rng):
+        """
+        Returns the indices of the particles picked for the next generation.
+        The candidate batch is doubled until the KLD bound is met, so a
+        converged cloud never draws more than a few times min_count samples.
+        """
+        indices = np.empty(0, dtype=np.intp)
+        count = self.min_count
+        while True:
+            drawn = self.resampler.resample(particles.weights, count - len(indices), rng)
+            indices = np.concatenate((indices, drawn))
+            ids = self.bin_ids(particles.x[indices], particles.y[indices],
+                               particles.orientation[indices], world_size)
+
+            first_seen = np.zeros(count, dtype=bool)
+            first_seen[np.unique(ids, return_index=True)[1]] = True
+            required = kld_sample_size(np.cumsum(first_seen), self.epsilon, self.delta)
+            np.maximum(required, self.min_count, out=required)
+            enough = np.flatnonzero(np.arange(1, count + 1) >= required)
+
+            if len(enough) > 0:
+                return indices[:enough[0] + 1]
+            if count == self.max_count:
+                return indices
+            count = min(2 * count, self.max_count)
@@ -0,0 +1,158 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Per stage timers and counters for the filters
+"""
+from collections import defaultdict
+from time import perf_counter
+
+
+class _StageTimer(object):
+    """
+    Context manager that adds the time spent inside it to one stage.
+    One timer is kept per stage, so timing allocates nothing.
+    """
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        metrics = self.metrics
+        metrics.totals[self.name] += elapsed
+        metrics.calls[self.name] += 1
+        metrics.last[self.name] = elapsed
+
+
+class FilterMetrics(object):
+    """
+    Collects per stage timings (total, call count and last duration) and
+    counters. end_cycle() hands a snapshot to every exporter, an exporter is
+    any callable taking the snapshot dict.
+    """
+    enabled = True
+
+    def __init__(self, exporters=None):
+        self.exporters = list(exporters or [])
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.last = {}
+        self.counters = defaultdict(float)
+        self._timers = {}
+
+    def stage(self, name):
+        """
+        Returns the context manager that times the named stage
+        """
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = self._timers[name] = _StageTimer(self, name)
+        return timer
+
+    def increment(self, name, value=1):
+        """
+        Adds value to a counter
+        """
+        self.counters[name] += value
+
+    def set(self, name, value):
+        """
+        Sets a gauge counter to value
+        """
+        self.counters[name] = value
+
+    def snapshot(self):
+        """
+        Returns the current timings and counters as a dict
+        """
+        return {
+            'stages': {name: {'total': self.totals[name], 'calls': self.calls[name],
+                              'last': self.last[name]} for name in self.last},
+            'counters': dict(self.counters),
+        }
+
+    def end_cycle(self):
+        """
+        Marks the end of a filter cycle and calls the exporters
+        """
+        self.counters['cycles'] += 1
+        if self.exporters:
+            snapshot = self.snapshot()
+            for exporter in self.exporters:
+                exporter(snapshot)
+
+    def reset(self):
+        """
+        Clears every timing and counter
+        """
+        self.totals.clear()
+        self.calls.clear()
+        self.last.clear()
+        self.counters.clear()
+
+
+class _NullStage(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+class NullMetrics(object):
+    """
+    Disabled instrumentation with the FilterMetrics interface.
+    Every call is a no-op, so filters can always call their metrics.
+    """
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def increment(self, name, value=1):
+        pass
+
+    def set(self, name, value):
+        pass
+
+    def snapshot(self):
+        return {'stages': {}, 'counters': {}}
+
+    def end_cycle(self):
+        pass
+
+    def reset(self):
+        pass
+
+
+NULL_METRICS = NullMetrics()
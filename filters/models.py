@@ -0,0 +1,123 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Vectorized motion and measurement models working on whole particle arrays.
+They follow the semantics of Robot.move and Robot.measurement_prob.
+"""
+from math import pi
+
+import numpy as np
+
+
+def move(x, y, orientation, turn, forward, turn_noise, forward_noise, world_size, rng,
+         trig=None):
+    """
+    Moves every particle in place: turn first, then go forward, both with
+    gaussian noise, and wrap the result around the cyclic world.
+    Noise for all particles is drawn with a single RNG call.
+    With a fast_math.TrigTable, sin and cos are looked up instead of computed.
+    """
+    if np.any(np.asarray(forward) < 0):
+        raise ValueError('Robot cant move backwards')
+
+    noise = rng.standard_normal((2,) + orientation.shape)
+    noise[0] *= turn_noise
+    noise[1] *= forward_noise
+
+    # turn, and add randomness to the turning command
+    orientation += turn
+    orientation += noise[0]
+    np.mod(orientation, 2.0 * pi, out=orientation)
+
+    # move, and add randomness to the motion command
+    dist = noise[1]
+    dist += forward
+    if trig is None:
+        cos, sin = np.cos(orientation), np.sin(orientation)
+    else:
+        sin, cos = trig.sin_cos(orientation)
+    x += cos * dist
+    y += sin * dist
+    np.mod(x, world_size, out=x)    # cyclic truncate
+    np.mod(y, world_size, out=y)
+
+
+def landmark_distances(x, y, landmarks):
+    """
+    Returns the distance of every particle to every landmark
+    as an array of shape x.shape + (len(landmarks),)
+    """
+    d_x = x[..., np.newaxis] - landmarks[:, 0]
+    d_y = y[..., np.newaxis] - landmarks[:, 1]
+    return np.hypot(d_x, d_y)
+
+
+def log_likelihood(x, y, landmarks, measurement, sense_noise):
+    """
+    Returns the log probability of the range measurement for every particle.
+    This is the log of Robot.measurement_prob, evaluated for all particles and
+    all landmarks with one broadcast, so it doesn't underflow for many landmarks.
+    """
+    if sense_noise <= 0:
+        raise ValueError('Sense noise must be greater than 0.')
+    measurement = np.asarray(measurement, dtype=np.float64)
+    error = landmark_distances(x, y, landmarks)
+    error -= measurement
+    error *= error
+    log_prob = error.sum(axis=-1)
+    log_prob *= -0.5 / (sense_noise ** 2)
+    log_prob -= measurement.shape[-1] * 0.5 * np.log(2.0 * pi * sense_noise ** 2)
+    return log_prob
+
+
+def log_normalize(log_weights):
+    """
+    Normalizes log weights in place with the log-sum-exp trick and returns them.
+    Rows without any finite weight fall back to uniform weights.
+    """
+    total = np.asarray(log_sum_exp(log_weights))
+    degenerate = ~np.isfinite(total)
+    if degenerate.any():
+        log_weights[degenerate, ...] = 0.0
+        total = np.where(degenerate, np.log(log_weights.shape[-1]), total)
+    log_weights -= total[..., np.newaxis]
+    return log_weights
+
+
+def effective_sample_size(weights):
+    """
+    Returns the effective sample size 1 / sum(w ** 2) of normalized weights
+    along the last axis
+    """
+    return 1.0 / np.einsum('...i,...i->...', weights, weights)
+
+
+def log_sum_exp(log_weights):
+    """
+    Returns log(sum(exp(log_weights))) along the last axis without overflowing
+    """
+    peak = np.max(log_weights, axis=-1)
+    peak = np.where(np.isfinite(peak), peak, 0.0)
+    total = np.exp(log_weights - peak[..., np.newaxis]).sum(axis=-1)
+    with np.errstate(divide='ignore'):
+        return np.log(total) + peak
@@ -21,19 +21,289 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+import numpy as np
+
+from robot_localization.filters import estimation, models
+from robot_localization.filters.fast_math import NoiseConstants
 from robot_localization.filters.filter import Filter
-from robot_localization.utils.vector import Vector2D
+from robot_localization.filters.kld import KLDSampler
+from robot_localization.filters.metrics import NULL_METRICS
+from robot_localization.filters.particle_set import ParticleBuffer, ParticleSet
+from robot_localization.maps.free_space import FreeSpaceSampler
+from robot_localization.maps.landmark_map import LandmarkMap
+from robot_localization.maps.likelihood_field import LikelihoodField
+from robot_localization.resampling import Resampler, SystematicResampler
+from robot_localization.robot import Robot
+from robot_localization.utils.rng import make_rng
 
 class ParticleFilter(Filter):
+    """
+    Particle filter that keeps its particle cloud in a ParticleSet.
+    Robot instances are only created on demand as single pose views.
+    """
+
+    def __init__(self, particle_count=1000, world_size=None, landmarks=None, rng=None,
+                 resampler: Resampler = None, ess_threshold=0.5, kld: KLDSampler = None,
+                 likelihood_field: LikelihoodField = None, metrics=None, fast_math=False,
+                 free_space: FreeSpaceSampler = None, alpha_slow=0.0, alpha_fast=0.0):
+        super().__init__()
+        if world_size is None:
+            world_size = Robot.world_size
+        if landmarks is None:
+            landmarks = Robot.landmarks
+
+        self.particle_count = particle_count
+        self.world_size = float(world_size)
+        if not isinstance(landmarks, LandmarkMap):
+            landmarks = LandmarkMap(landmarks)
+
+        self.landmark_map = landmarks
+        self.landmarks = landmarks.landmarks
+        self.rng = make_rng(rng)
+        self.resampler = resampler if resampler is not None else SystematicResampler()
+        self.kld = kld
+        self.likelihood_field = likelihood_field
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        self.ess_threshold = ess_threshold
+        self.ess = float(particle_count)
+        self.step_count = 0
+        self.replay_log = None
+        self.forward_noise = 0.0
+        self.turn_noise = 0.0
+        self.sense_noise = 0.0
+        self.fast_math = fast_math
+        self._constants = None
+        self.free_space = free_space
+        self.alpha_slow = alpha_slow
+        self.alpha_fast = alpha_fast
+        # short and long term averages of the measurement likelihood, kept as
+        # logs since the likelihood itself underflows with many landmarks
+        self.log_w_slow = -np.inf
+        self.log_w_fast = -np.inf
+        self.particles = self.random_particles(particle_count)
+        self.buffer = ParticleBuffer(particle_count)
+
+    def set_noise(self, new_f_noise, new_t_noise, new_s_noise):
+        """
+        Sets the noise parameters shared by every particle
+        """
+        self.forward_noise = float(new_f_noise)
+        self.turn_noise = float(new_t_noise)
+        self.sense_noise = float(new_s_noise)
+        self._constants = None
+
+    @property
+    def constants(self):
+        """
+        Returns the NoiseConstants for the current noise and fast_math setting,
+        rebuilt only when one of them changed
+        """
+        key = (self.forward_noise, self.turn_noise, self.sense_noise, self.fast_math)
+        if self._constants is None or self._constants.key != key:
+            self._constants = NoiseConstants(*key)
+        return self._constants
+
+    def set_particles(self, particles: ParticleSet):
+        """
+        Replaces the particle cloud
+        """
+        self.particles = particles
+        self.particle_count = len(particles)
+        self.ess = float(models.effective_sample_size(particles.weights))
+
+    def get_particle(self, index) -> Robot:
+        """
+        Returns the particle at index as a Robot instance
+        """
+        return self.particles.get_robot(
+            index, (self.forward_noise, self.turn_noise, self.sense_noise))
+
+    def move_particles(self, turn, forward):
+        """
+        Moves the whole particle cloud with the given command,
+        same semantics as calling Robot.move on every particle
+        """
+        particles = self.particles
+        with self.metrics.stage('motion'):
+            models.move(particles.x, particles.y, particles.orientation, float(turn),
+                        float(forward), self.turn_noise, self.forward_noise, self.world_size,
+                        self.rng, self.constants.trig)
+
+    def extract_weights(self, reference_distances: list, landmark_ids=None):
+        """
+        Weights the particles by how well they explain the measured distances
+        to the landmarks, on top of the weights they carry from previous steps.
+        With landmark_ids, as returned by LandmarkMap.sense, only the landmarks
+        seen by a range limited sensor are evaluated. With a likelihood_field
+        the landmark distances are looked up instead of computed.
+        Stores the normalized weights in the particle set, updates the effective
+        sample size and returns the weights as log weights.
+        """
+        particles = self.particles
+        metrics = self.metrics
+        constants = self.constants
+        with metrics.stage('weighting'):
+            if self.likelihood_field is not None:
+                log_weights = self.likelihood_field.log_likelihood(
+                    particles.x, particles.y, reference_distances, self.sense_noise,
+                    landmark_ids)
+            else:
+                landmarks = self.landmarks if landmark_ids is None else self.landmarks[landmark_ids]
+                log_weights = constants.log_likelihood(particles.x, particles.y, landmarks,
+                                                       reference_distances)
+            with np.errstate(divide='ignore'):
+                log_weights += np.log(particles.weights)
+            if self.alpha_slow > 0.0:
+                # average measurement likelihood, the normalizer of the new weights
+                log_average = float(models.log_sum_exp(log_weights))
+                self.log_w_slow = self._log_smooth(self.log_w_slow, log_average, self.alpha_slow)
+                self.log_w_fast = self._log_smooth(self.log_w_fast, log_average, self.alpha_fast)
+            models.log_normalize(log_weights)
+            np.exp(log_weights, out=particles.weights)
+            self.ess = float(models.effective_sample_size(particles.weights))
+        if metrics.enabled:
+            metrics.set('ess', self.ess)
+            metrics.set('weight_underflows', int(np.count_nonzero(particles.weights == 0.0)))
+        return log_weights
+
+    def needs_resampling(self):
+        """
+        Returns True if the effective sample size dropped below
+        ess_threshold times the particle count
+        """
+        return self.ess < self.ess_threshold * len(self.particles)
+
+    def resample(self):
+        """
+        Draws a new generation of particles according to the current weights.
+        With a KLDSampler the size of the new generation adapts to the posterior,
+        otherwise particle_count particles are drawn by the resampler.
+        The new generation is gathered into the preallocated ParticleBuffer,
+        so the previous particle set is overwritten by the resample after next.
+        """
+        with self.metrics.stage('resampling'):
+            if self.kld is not None:
+                indices = self.kld.sample(self.particles, self.world_size, self.rng)
+            else:
+                indices = self.resampler.resample(self.particles.weights, self.particle_count,
+                                                  self.rng)
+            self.particles = self.buffer.select(self.particles, indices)
+            self.particle_count = len(indices)
+            self._inject()
+            self.ess = float(len(self.particles))
+        self.metrics.increment('resample_count')
+        return indices
+
+    def _inject(self):
+        """
+        Replaces injection_ratio of the freshly resampled particles
+        by random particles
+        """
+        count = int(self.injection_ratio() * self.particle_count)
+        if count == 0:
+            return
+        particles = self.particles
+        slots = self.rng.choice(self.particle_count, count, replace=False)
+        spread = self.random_particles(count)
+        particles.x[slots] = spread.x
+        particles.y[slots] = spread.y
+        particles.orientation[slots] = spread.orientation
+        self.metrics.increment('injected_particles', count)
+
+    def estimate(self):
+        """
+        Returns the weighted mean pose (x, y, orientation) of the particles
+        """
+        particles = self.particles
+        with self.metrics.stage('estimation'):
+            return estimation.weighted_mean(particles.x, particles.y, particles.orientation,
+                                            particles.weights, self.world_size)
+
+    def covariance(self):
+        """
+        Returns the 3x3 covariance of the particles around the mean pose
+        """
+        particles = self.particles
+        return estimation.covariance(particles.x, particles.y, particles.orientation,
+                                     particles.weights, world_size=self.world_size)
+
+    def random_particles(self, count):
+        """
+        Returns count particles spread uniformly over the free space if a
+        FreeSpaceSampler is set, otherwise over the whole world
+        """
+        if self.free_space is not None:
+            return self.free_space.sample(count, self.rng)
+        return ParticleSet.uniform(count, self.world_size, self.rng)
+
+    def injection_ratio(self):
+        """
+        Returns the share of random particles injected at resampling,
+        max(0, 1 - w_fast / w_slow) as in augmented MCL. It stays 0 unless
+        alpha_fast > alpha_slow > 0.
+        """
+        if not 0.0 < self.alpha_slow < self.alpha_fast or self.log_w_slow == -np.inf:
+            return 0.0
+        return max(0.0, -np.expm1(self.log_w_fast - self.log_w_slow))
+
+    @staticmethod
+    def _log_smooth(log_average, log_value, alpha):
+        """
+        Returns log((1 - alpha) * average + alpha * value) from the logs
+        """
+        if alpha >= 1.0:
+            return log_value
+        return float(np.logaddexp(np.log1p(-alpha) + log_average, np.log(alpha) + log_value))
 
-    def __init__(self):
-        self.particle_count = 1000
+    def reseed(self, mean, cov, count=None, uniform_fraction=0.0):
+        """
+        Replaces the particles with count samples from the gaussian (mean, cov)
+        over (x, y, orientation), wrapped into the world. uniform_fraction of
+        them are spread uniformly instead, to recover from a wrong mean.
+        """
+        if count is None:
+            count = self.particle_count
+        uniform = int(round(count * uniform_fraction))
+        samples = self.rng.multivariate_normal(mean, cov, count - uniform, method='eigh')
+        particles = ParticleSet(samples[:, 0] % self.world_size, samples[:, 1] % self.world_size,
+                                samples[:, 2] % (2.0 * np.pi))
+        if uniform > 0:
+            spread = self.random_particles(uniform)
+            particles = ParticleSet(np.concatenate((particles.x, spread.x)),
+                                    np.concatenate((particles.y, spread.y)),
+                                    np.concatenate((particles.orientation, spread.orientation)))
+        self.set_particles(particles)
 
-    def move_particles(self, vector: Vector2D):
-        pass
+    def predict(self, turn, forward):
+        """
+        Motion step, same API as the Kalman localizers
+        """
+        self.move_particles(turn, forward)
 
-    def extract_weights(self, reference_distances: list):
-        pass
+    def update(self, measurement, landmark_ids=None):
+        """
+        Measurement step, weights the particles and resamples them if needed
+        """
+        self.extract_weights(measurement, landmark_ids)
+        if self.needs_resampling():
+            self.resample()
 
-    def filter(self) -> list:
-        pass
+    def filter(self, turn, forward, measurement, landmark_ids=None) -> ParticleSet:
+        """
+        Runs one predict, weight and resample cycle and returns the particles.
+        Resampling is skipped while the effective sample size stays above
+        the threshold, the weights are carried over to the next cycle instead.
+        If a replay_log is set the inputs are recorded before they are applied.
+        The returned set is the live state of the filter, not a snapshot: later
+        cycles move its particles in place, and its arrays are views into the
+        resampling double buffer that the resample after next overwrites.
+        Call .copy() on it to keep a generation.
+        """
+        if self.replay_log is not None:
+            self.replay_log.record(self.step_count, turn, forward, measurement, landmark_ids)
+        self.predict(turn, forward)
+        self.update(measurement, landmark_ids)
+        self.step_count += 1
+        self.metrics.set('particles', len(self.particles))
+        self.metrics.end_cycle()
+        return self.particles
@@ -0,0 +1,155 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Struct-of-arrays storage for particle clouds
+"""
+from math import pi
+
+import numpy as np
+
+from robot_localization.robot import Robot
+from robot_localization.utils.rng import make_rng
+
+
+class ParticleSet(object):
+    """
+    Holds a particle cloud as contiguous arrays instead of a list of Robot objects.
+    x, y, orientation and weights are float64 arrays that share the same length,
+    so a million particles cost four flat buffers rather than a million dicts.
+    """
+
+    def __init__(self, x, y, orientation, weights=None):
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.orientation = np.ascontiguousarray(orientation, dtype=np.float64)
+
+        if not self.x.shape == self.y.shape == self.orientation.shape or self.x.ndim != 1:
+            raise ValueError("x, y and orientation must be 1-dim arrays with the same length.")
+
+        if weights is None:
+            self.weights = np.full(len(self.x), 1.0 / max(len(self.x), 1))
+        else:
+            self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+            if self.weights.shape != self.x.shape:
+                raise ValueError("Weights must have the same length as the particles.")
+
+    @classmethod
+    def uniform(cls, count, world_size, rng=None):
+        """
+        Creates count particles spread uniformly over the world,
+        the array counterpart of calling Robot() count times
+        """
+        if count <= 0:
+            raise ValueError("Particle count must be greater than 0.")
+        samples = make_rng(rng).random((3, count))
+        samples[0] *= world_size
+        samples[1] *= world_size
+        samples[2] *= 2.0 * pi
+        return cls(samples[0], samples[1], samples[2])
+
+    @classmethod
+    def from_robots(cls, robots):
+        """
+        Creates a particle set from a list of Robot instances
+        """
+        x = np.fromiter((r.x for r in robots), dtype=np.float64, count=len(robots))
+        y = np.fromiter((r.y for r in robots), dtype=np.float64, count=len(robots))
+        orientation = np.fromiter((r.orientation for r in robots), dtype=np.float64,
+                                  count=len(robots))
+        return cls(x, y, orientation)
+
+    def get_robot(self, index, noise=(0.0, 0.0, 0.0)):
+        """
+        Returns a Robot instance that mirrors the pose of the particle at index.
+        The Robot is a copy, changing it does not change the particle set.
+        """
+        robot = Robot()
+        robot.set(self.x[index], self.y[index], self.orientation[index])
+        robot.set_noise(*noise)
+        return robot
+
+    def normalize_weights(self):
+        """
+        Scales the weights so that they sum up to 1
+        """
+        total = self.weights.sum()
+        if total <= 0.0 or not np.isfinite(total):
+            self.weights.fill(1.0 / len(self))
+        else:
+            self.weights /= total
+
+    def select(self, indices):
+        """
+        Returns a new particle set built from the particles at given indices,
+        weights of the new set are uniform
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return ParticleSet(self.x[indices], self.y[indices], self.orientation[indices])
+
+    def copy(self):
+        """
+        Returns a deep copy of the particle set
+        """
+        return ParticleSet(self.x.copy(), self.y.copy(), self.orientation.copy(),
+                           self.weights.copy())
+
+    def __len__(self):
+        return len(self.x)
+
+    def __repr__(self):
+        return '<ParticleSet count=%d>' % len(self)
+
+
+class ParticleBuffer(object):
+    """
+    Double buffer for resampling without allocations. Each buffer is a
+    (4, capacity) array holding x, y, orientation and weights rows.
+    select gathers a new generation into the back buffer with np.take and
+    swaps front and back, so the previous generation stays valid until the
+    next select. A buffer only grows, doubling, when a generation outgrows
+    it, which covers the variable particle counts of KLD sampling.
+    """
+
+    def __init__(self, capacity):
+        self.front = np.empty((4, capacity))
+        self.back = np.empty((4, capacity))
+
+    @property
+    def capacity(self):
+        return min(self.front.shape[1], self.back.shape[1])
+
+    def select(self, particles: ParticleSet, indices):
+        """
+        Returns the particles at given indices as a ParticleSet with uniform
+        weights whose arrays are views into the (new) front buffer
+        """
+        count = len(indices)
+        if count > self.back.shape[1]:
+            self.back = np.empty((4, max(count, 2 * self.back.shape[1])))
+        back = self.back[:, :count]
+        np.take(particles.x, indices, out=back[0])
+        np.take(particles.y, indices, out=back[1])
+        np.take(particles.orientation, indices, out=back[2])
+        back[3].fill(1.0 / count)
+        self.front, self.back = self.back, self.front
+        return ParticleSet(back[0], back[1], back[2], back[3])
@@ -0,0 +1,280 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Particle filter sharded across worker processes.
+Particles live in shared memory, so only commands and a few scalars
+travel through the pipes on every step.
+"""
+import multiprocessing
+import os
+import weakref
+from math import log
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from robot_localization.filters import models
+from robot_localization.filters.filter import Filter
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.robot import Robot
+from robot_localization.utils.rng import make_rng, spawn
+
+# rows of the shared block: front x, y, orientation, back x, y, orientation,
+# log weights and weights
+_ROWS = 8
+
+
+def _worker(connection, memory_name, count, low, high, world_size, landmarks, rng):
+    """
+    Runs in a worker process and owns the particles in [low, high)
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    block = np.ndarray((_ROWS, count), dtype=np.float64, buffer=memory.buf)
+    buffers = (block[0:3], block[3:6])
+    log_weights = block[6, low:high]
+    weights = block[7, low:high]
+    rng = make_rng(rng)
+    forward_noise, turn_noise, sense_noise = 0.0, 0.0, 0.0
+    front = 0
+
+    try:
+        while True:
+            command, args = connection.recv()
+            if command == 'stop':
+                break
+            try:
+                if command == 'noise':
+                    forward_noise, turn_noise, sense_noise = args
+                    connection.send(None)
+                elif command == 'predict':
+                    turn, forward, measurement, landmark_ids = args
+                    x, y, orientation = buffers[front][:, low:high]
+                    models.move(x, y, orientation, turn, forward, turn_noise, forward_noise,
+                                world_size, rng)
+                    seen = landmarks if landmark_ids is None else landmarks[landmark_ids]
+                    log_weights[:] = models.log_likelihood(x, y, seen, measurement, sense_noise)
+                    with np.errstate(divide='ignore'):
+                        log_weights += np.log(weights)
+                    connection.send(float(models.log_sum_exp(log_weights)))
+                elif command == 'normalize':
+                    np.exp(log_weights - args, out=weights)
+                    connection.send((float(weights.sum()), float(np.dot(weights, weights))))
+                elif command == 'resample':
+                    seed_offset, weight_offset, scale, start, end = args
+                    cumulative = np.cumsum(weights)
+                    cumulative *= scale
+                    cumulative += weight_offset
+                    positions = np.arange(start, end, dtype=np.float64)
+                    positions += seed_offset
+                    positions /= count
+                    indices = np.searchsorted(cumulative, positions, side='right')
+                    np.clip(indices, 0, high - low - 1, out=indices)
+                    buffers[1 - front][:, start:end] = buffers[front][:, low:high][:, indices]
+                    connection.send(None)
+                elif command == 'swap':
+                    front = 1 - front
+                    weights.fill(1.0 / count)
+                    log_weights.fill(-log(count))
+                    connection.send(None)
+            except Exception as error:
+                # the coordinator re-raises it, the worker keeps serving
+                connection.send(error)
+    finally:
+        del block, buffers, log_weights, weights
+        memory.close()
+
+
+def _release(memory, connections, processes):
+    """
+    Stops the workers and unlinks the shared memory. Tolerates workers that
+    already died, and runs from close() or, as a weakref finalizer, when an
+    unclosed filter is collected.
+    """
+    try:
+        for connection in connections:
+            try:
+                connection.send(('stop', None))
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+        for process in processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for connection in connections:
+            connection.close()
+    finally:
+        try:
+            memory.close()
+        except BufferError:
+            # views into the block are still alive, unlinking alone frees the segment
+            pass
+        memory.unlink()
+
+
+class ShardedParticleFilter(Filter):
+    """
+    Particle filter that splits its particles into shards, one per worker process.
+    Every shard runs the motion and weighting models on its own slice of the
+    shared arrays. Normalization only exchanges one log-sum-exp per shard, and
+    systematic resampling is distributed: each worker knows from its shard's
+    cumulative weight which output slots it fills, so it writes its own copies
+    into the back buffer and the buffers are swapped afterwards.
+    Call close(), or use the filter as a context manager, to stop the workers.
+    """
+
+    def __init__(self, particle_count=100000, workers=None, world_size=None, landmarks=None,
+                 seed=None, ess_threshold=0.5, mp_context=None):
+        super().__init__()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if particle_count < workers or workers <= 0:
+            raise ValueError("Every worker needs at least one particle.")
+        if world_size is None:
+            world_size = Robot.world_size
+        if landmarks is None:
+            landmarks = Robot.landmarks
+
+        self.particle_count = particle_count
+        self.world_size = float(world_size)
+        self.landmarks = np.array(landmarks, dtype=np.float64).reshape(-1, 2)
+        self.ess_threshold = ess_threshold
+        self.ess = float(particle_count)
+        self.sense_noise = 0.0
+        self.bounds = np.linspace(0, particle_count, workers + 1).astype(np.intp)
+
+        streams = spawn(seed, workers + 1)
+        self.rng = streams[0]
+
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=_ROWS * particle_count * np.dtype(np.float64).itemsize)
+        self.block = np.ndarray((_ROWS, particle_count), dtype=np.float64, buffer=self.memory.buf)
+        self.front = 0
+        initial = ParticleSet.uniform(particle_count, self.world_size, self.rng)
+        self.block[0:3] = (initial.x, initial.y, initial.orientation)
+        self.block[6] = -log(particle_count)
+        self.block[7] = 1.0 / particle_count
+
+        context = multiprocessing.get_context(mp_context)
+        self.connections = []
+        self.processes = []
+        for i in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker, daemon=True,
+                args=(child, self.memory.name, particle_count, self.bounds[i],
+                      self.bounds[i + 1], self.world_size, self.landmarks, streams[i + 1]))
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+        self._finalizer = weakref.finalize(self, _release, self.memory, self.connections,
+                                           self.processes)
+
+    def _broadcast(self, command, args):
+        """
+        Sends the command to every worker and collects the replies.
+        args is either shared by every worker or a list with one entry per worker.
+        An exception raised in a worker is re-raised here.
+        """
+        for i, connection in enumerate(self.connections):
+            connection.send((command, args[i] if isinstance(args, list) else args))
+        replies = [connection.recv() for connection in self.connections]
+        for reply in replies:
+            if isinstance(reply, Exception):
+                raise reply
+        return replies
+
+    def set_noise(self, new_f_noise, new_t_noise, new_s_noise):
+        """
+        Sets the noise parameters of every shard
+        """
+        self.sense_noise = float(new_s_noise)
+        self._broadcast('noise', (float(new_f_noise), float(new_t_noise), float(new_s_noise)))
+
+    @property
+    def particles(self) -> ParticleSet:
+        """
+        Returns a copy of the particles gathered from every shard
+        """
+        x, y, orientation = self.block[3 * self.front:3 * self.front + 3]
+        return ParticleSet(x.copy(), y.copy(), orientation.copy(), self.block[7].copy())
+
+    def resample(self, shard_weights):
+        """
+        Distributed systematic resampling, shard_weights holds
+        the total weight of every shard
+        """
+        cumulative = np.cumsum(shard_weights)
+        scale = 1.0 / cumulative[-1]
+        cumulative *= scale
+        seed_offset = self.rng.random()
+        ends = np.clip(np.ceil(cumulative * self.particle_count - seed_offset), 0,
+                       self.particle_count).astype(np.intp)
+        ends[-1] = self.particle_count
+        starts = np.concatenate(([0], ends[:-1]))
+        offsets = np.concatenate(([0.0], cumulative[:-1]))
+
+        self._broadcast('resample', [(seed_offset, float(offsets[i]), scale, int(starts[i]),
+                                      int(ends[i])) for i in range(len(self.connections))])
+        self._broadcast('swap', None)
+        self.front = 1 - self.front
+        self.ess = float(self.particle_count)
+
+    def filter(self, turn, forward, measurement, landmark_ids=None):
+        """
+        Runs one predict, weight and resample cycle on every shard.
+        Resampling is skipped while the effective sample size stays
+        above the threshold.
+        """
+        if forward < 0:
+            raise ValueError('Robot cant move backwards')
+        if self.sense_noise <= 0:
+            raise ValueError('Sense noise must be greater than 0.')
+        expected = len(self.landmarks) if landmark_ids is None else len(landmark_ids)
+        if len(measurement) != expected:
+            raise ValueError('Expected one measurement per landmark.')
+        totals = self._broadcast('predict', (float(turn), float(forward),
+                                             np.asarray(measurement, dtype=np.float64),
+                                             landmark_ids))
+        total = float(models.log_sum_exp(np.array(totals)))
+        sums = np.array(self._broadcast('normalize', total))
+        self.ess = 1.0 / sums[:, 1].sum()
+        if self.ess < self.ess_threshold * self.particle_count:
+            self.resample(sums[:, 0])
+
+    def close(self):
+        """
+        Stops the workers and releases the shared memory
+        """
+        if self.memory is None:
+            return
+        del self.block
+        self.memory = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
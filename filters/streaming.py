@@ -0,0 +1,113 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Streaming front-end that feeds timestamped odometry and range readings
+into a particle filter and yields pose estimates as they become available
+"""
+import asyncio
+import heapq
+from collections import namedtuple
+
+Odometry = namedtuple('Odometry', ['timestamp', 'turn', 'forward'])
+RangeMeasurement = namedtuple('RangeMeasurement', ['timestamp', 'distances', 'landmark_ids'])
+RangeMeasurement.__new__.__defaults__ = (None,)
+PoseEstimate = namedtuple('PoseEstimate', ['timestamp', 'x', 'y', 'orientation', 'ess'])
+
+_END = object()
+
+
+def estimate_pose(particle_filter, timestamp) -> PoseEstimate:
+    """
+    Returns the weighted mean pose of the particle cloud
+    """
+    return PoseEstimate(timestamp, *particle_filter.estimate(), float(particle_filter.ess))
+
+
+def apply(particle_filter, reading):
+    """
+    Applies one reading to the filter. Odometry runs the motion model,
+    a range measurement runs the weighting and, if needed, resampling.
+    Returns a pose estimate after measurements and None after odometry.
+    """
+    if isinstance(reading, Odometry):
+        particle_filter.move_particles(reading.turn, reading.forward)
+        return None
+    particle_filter.extract_weights(reading.distances, reading.landmark_ids)
+    if particle_filter.needs_resampling():
+        particle_filter.resample()
+    return estimate_pose(particle_filter, reading.timestamp)
+
+
+def localize(particle_filter, odometry, measurements):
+    """
+    Generator that interleaves two timestamp ordered iterables of Odometry and
+    RangeMeasurement readings by timestamp and yields a PoseEstimate after
+    every measurement. Readings are pulled lazily, nothing is buffered beyond
+    the next reading of each stream.
+    """
+    for reading in heapq.merge(odometry, measurements, key=lambda reading: reading.timestamp):
+        estimate = apply(particle_filter, reading)
+        if estimate is not None:
+            yield estimate
+
+
+async def _fill(queue, readings):
+    try:
+        async for reading in readings:
+            await queue.put(reading)
+    finally:
+        await queue.put(_END)
+
+
+async def localize_async(particle_filter, odometry, measurements, maxsize=16):
+    """
+    Async generator version of localize for asyncio streams.
+    Each stream is read into its own bounded queue, so a fast producer
+    waits once maxsize readings are pending (backpressure). The next reading
+    to apply is the one with the smallest timestamp among the stream heads.
+    An exception raised by a stream is re-raised here once its queue is drained.
+    """
+    queues = [asyncio.Queue(maxsize), asyncio.Queue(maxsize)]
+    tasks = [asyncio.ensure_future(_fill(queue, stream))
+             for queue, stream in zip(queues, (odometry, measurements))]
+    heads = [None, None]
+    try:
+        while True:
+            for i, queue in enumerate(queues):
+                if heads[i] is None:
+                    heads[i] = await queue.get()
+                    if heads[i] is _END:
+                        # the stream has ended, re-raises the error it failed with
+                        await tasks[i]
+            pending = [i for i, head in enumerate(heads) if head is not _END]
+            if not pending:
+                break
+            i = min(pending, key=lambda i: heads[i].timestamp)
+            estimate = apply(particle_filter, heads[i])
+            heads[i] = None
+            if estimate is not None:
+                yield estimate
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,51 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.batch_filter import BatchParticleFilter
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.filters.particle_set import ParticleSet
+
+class TestBatchParticleFilter(unittest.TestCase):
+
+    def test_weights_match_single_filter(self):
+        print("\n[!] BatchParticleFilter.extract_weights testing..")
+        landmarks = [[[20.0, 20.0], [80.0, 80.0]], [[10.0, 50.0], [50.0, 10.0], [90.0, 90.0]]]
+        batch = BatchParticleFilter(2, 100, landmarks=landmarks, rng=np.random.default_rng(15))
+        batch.set_noise(0.05, 0.05, [5.0, 3.0])
+        z = [[30.0, 40.0], [20.0, 60.0, 50.0]]
+        batch.extract_weights(z)
+        for k in range(2):
+            single = ParticleFilter(100, landmarks=landmarks[k])
+            single.set_noise(0.05, 0.05, batch.sense_noise[k])
+            single.set_particles(ParticleSet(batch.x[k], batch.y[k], batch.orientation[k]))
+            single.extract_weights(z[k])
+            self.assertTrue(np.allclose(single.particles.weights, batch.weights[k]))
+        particles = batch.get_particles(0)
+        particles.x += 1.0
+        particles.weights[:] = 0.0
+        self.assertFalse(np.array_equal(particles.x, batch.x[0]))
+        self.assertTrue(np.all(batch.weights[0] > 0.0))
+        print("[*] Test done")
+
+    def test_fleet_converges(self):
+        print("\n[!] BatchParticleFilter fleet testing..")
+        rng = np.random.default_rng(16)
+        landmarks = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+        world_size = np.array([100.0] * 4 + [200.0] * 4)
+        batch = BatchParticleFilter(8, 2000, world_size=world_size, landmarks=landmarks, rng=rng)
+        batch.set_noise(0.05, 0.05, 2.0)
+        x, y = rng.random((2, 8)) * 100.0
+        orientation = np.zeros(8)
+        for t in range(10):
+            models.move(x, y, orientation, 0.1, 5.0, 0.0, 0.0, world_size, rng)
+            z = models.landmark_distances(x, y, landmarks)
+            batch.filter(np.full(8, 0.1), np.full(8, 5.0), z)
+        for k in range(8):
+            mean_x = np.average(batch.x[k], weights=batch.weights[k])
+            mean_y = np.average(batch.y[k], weights=batch.weights[k])
+            self.assertLess(np.hypot(mean_x - x[k], mean_y - y[k]), 5.0)
+        print("[*] Test done")
+
+if __name__ == '__main__':
+    unittest.main()
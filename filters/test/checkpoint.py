@@ -0,0 +1,138 @@
+#pylint: disable-all
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from robot_localization.filters.checkpoint import (ReplayLog, load_checkpoint, replay,
+                                                   save_checkpoint)
+from robot_localization.filters.kld import KLDSampler
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.maps.free_space import FreeSpaceSampler
+from robot_localization.maps.landmark_map import LandmarkMap
+from robot_localization.maps.likelihood_field import LikelihoodField
+from robot_localization.planning.grid import OccupancyGrid
+from robot_localization.resampling import StratifiedResampler
+from robot_localization.robot import Robot
+
+MEASUREMENTS = [[30.0 + t, 60.0 - t, 50.0, 40.0 + t] for t in range(8)]
+
+class TestCheckpoint(unittest.TestCase):
+
+    def test_restore_and_replay(self):
+        print("\n[!] Checkpoint and replay testing..")
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'filter.npz')
+            log = os.path.join(directory, 'filter.log')
+
+            pf = ParticleFilter(2000, rng=np.random.default_rng(26), ess_threshold=0.7)
+            pf.set_noise(0.05, 0.05, 5.0)
+            with ReplayLog(log) as pf.replay_log:
+                for t, z in enumerate(MEASUREMENTS):
+                    if t == 3:
+                        save_checkpoint(pf, checkpoint)
+                    pf.filter(0.1, 5.0, z)
+                # every step is on disk before the log is closed
+                self.assertEqual(len(list(ReplayLog.read(log))), len(MEASUREMENTS))
+            self.assertTrue(pf.replay_log.file.closed)
+
+            restored = load_checkpoint(checkpoint)
+            self.assertEqual(restored.step_count, 3)
+            self.assertEqual(restored.sense_noise, 5.0)
+            replay(restored, log)
+            self.assertEqual(restored.step_count, len(MEASUREMENTS))
+            self.assertTrue(np.array_equal(restored.particles.x, pf.particles.x))
+            self.assertTrue(np.array_equal(restored.particles.weights, pf.particles.weights))
+
+            fresh = ParticleFilter(2000, rng=np.random.default_rng(26), ess_threshold=0.7)
+            fresh.set_noise(0.05, 0.05, 5.0)
+            replay(fresh, log)
+            self.assertTrue(np.array_equal(fresh.particles.orientation, pf.particles.orientation))
+        print("[*] Test done")
+
+    def test_augmented_state(self):
+        print("\n[!] Checkpoint augmented MCL state testing..")
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'filter.npz')
+            log = os.path.join(directory, 'filter.log')
+
+            blocked = np.zeros((10, 10), dtype=np.uint8)
+            blocked[:3, :3] = 1
+            free_space = FreeSpaceSampler(OccupancyGrid.from_rows(blocked), 10.0)
+            pf = ParticleFilter(2000, rng=np.random.default_rng(27), alpha_slow=0.05,
+                                alpha_fast=0.5, free_space=free_space)
+            pf.set_noise(0.05, 0.05, 5.0)
+            with ReplayLog(log) as pf.replay_log:
+                injected = 0
+                for t, z in enumerate(MEASUREMENTS):
+                    if t == 3:
+                        save_checkpoint(pf, checkpoint)
+                    pf.filter(0.1, 5.0, z)
+                    injected += t >= 3 and pf.injection_ratio() > 0.0
+            self.assertGreater(injected, 0)
+
+            restored = load_checkpoint(checkpoint)
+            self.assertEqual(restored.alpha_fast, 0.5)
+            self.assertTrue(np.array_equal(restored.free_space.free_cells, free_space.free_cells))
+            self.assertEqual(restored.free_space.cell_size, 10.0)
+            replay(restored, log)
+            self.assertEqual(restored.log_w_slow, pf.log_w_slow)
+            self.assertEqual(restored.log_w_fast, pf.log_w_fast)
+            self.assertTrue(np.array_equal(restored.particles.x, pf.particles.x))
+
+            with self.assertRaises(ValueError):
+                load_checkpoint(checkpoint, ParticleFilter(100, alpha_slow=0.05, alpha_fast=0.5))
+        print("[*] Test done")
+
+    def test_settings(self):
+        print("\n[!] Checkpoint filter settings testing..")
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'filter.npz')
+            log = os.path.join(directory, 'filter.log')
+
+            landmark_map = LandmarkMap(Robot.landmarks, sensor_range=60.0, cell_size=20.0)
+            pf = ParticleFilter(1000, 100.0, landmark_map, rng=np.random.default_rng(29),
+                                resampler=StratifiedResampler(), kld=KLDSampler(200, 3000),
+                                likelihood_field=LikelihoodField(Robot.landmarks, 100.0, 1.0),
+                                fast_math=True)
+            pf.set_noise(0.05, 0.05, 5.0)
+            with ReplayLog(log) as pf.replay_log:
+                for t, z in enumerate(MEASUREMENTS):
+                    if t == 3:
+                        save_checkpoint(pf, checkpoint)
+                    pf.filter(0.1, 5.0, z)
+
+            restored = load_checkpoint(checkpoint)
+            self.assertEqual(restored.landmark_map.sensor_range, 60.0)
+            self.assertEqual(restored.landmark_map.cell_size, 20.0)
+            self.assertIsInstance(restored.resampler, StratifiedResampler)
+            self.assertEqual(restored.kld.max_count, 3000)
+            self.assertEqual(restored.likelihood_field.resolution, 1.0)
+            self.assertTrue(restored.fast_math)
+            replay(restored, log)
+            self.assertTrue(np.array_equal(restored.particles.x, pf.particles.x))
+            self.assertTrue(np.array_equal(restored.particles.weights, pf.particles.weights))
+
+            with self.assertRaises(ValueError):
+                load_checkpoint(checkpoint, ParticleFilter(100))
+        print("[*] Test done")
+
+    def test_atomic_save(self):
+        print("\n[!] Checkpoint atomic save testing..")
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, 'filter.npz')
+            pf = ParticleFilter(200, rng=np.random.default_rng(28))
+            pf.set_noise(0.05, 0.05, 5.0)
+            save_checkpoint(pf, checkpoint)
+            pf.step_count = 5
+            # a crash after the new data was written but before it was synced
+            with mock.patch('os.fsync', side_effect=OSError('disk failure')):
+                with self.assertRaises(OSError):
+                    save_checkpoint(pf, checkpoint)
+            self.assertEqual(os.listdir(directory), ['filter.npz'])
+            self.assertEqual(load_checkpoint(checkpoint).step_count, 0)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
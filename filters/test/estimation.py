@@ -0,0 +1,59 @@
+#pylint: disable-all
+import unittest
+from math import sqrt
+import numpy as np
+from robot_localization.filters import estimation
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.robot import Robot, eval as robot_eval
+
+class TestEstimation(unittest.TestCase):
+
+    def test_weighted_mean(self):
+        print("\n[!] estimation.weighted_mean testing..")
+        x = np.array([99.0, 1.0, 98.0, 2.0])
+        orientation = np.array([0.1, 2 * np.pi - 0.1, 0.2, 2 * np.pi - 0.2])
+        weights = np.full(4, 0.25)
+        mean = estimation.weighted_mean(x, x, orientation, weights, world_size=100.0)
+        self.assertAlmostEqual(estimation.wrap(mean[0], 100.0), 0.0)
+        self.assertAlmostEqual(estimation.wrap(mean[2], 2 * np.pi), 0.0)
+        self.assertAlmostEqual(estimation.weighted_mean(x, x, orientation, weights)[0], 50.0)
+        print("[*] Test done")
+
+    def test_covariance(self):
+        print("\n[!] estimation.covariance testing..")
+        rng = np.random.default_rng(20)
+        x, y = rng.normal(50.0, [[2.0], [3.0]], (2, 20000))
+        orientation = rng.normal(0.0, 0.1, 20000) % (2 * np.pi)
+        weights = np.full(20000, 1.0 / 20000)
+        cov = estimation.covariance(x, y, orientation, weights, world_size=100.0)
+        self.assertTrue(np.allclose(np.sqrt(np.diag(cov)), [2.0, 3.0, 0.1], rtol=0.05))
+        print("[*] Test done")
+
+    def test_mode(self):
+        print("\n[!] estimation.mode testing..")
+        x = np.array([10.2, 10.4, 70.0, 30.0])
+        y = np.array([20.5, 20.7, 70.0, 30.0])
+        weights = np.array([0.3, 0.3, 0.35, 0.05])
+        mode = estimation.mode(x, y, np.zeros(4), weights, 100.0)
+        self.assertAlmostEqual(mode[0], 10.3)
+        self.assertAlmostEqual(mode[1], 20.6)
+        print("[*] Test done")
+
+    def test_eval(self):
+        print("\n[!] robot.eval testing..")
+        robot = Robot()
+        particles = [Robot() for _ in range(200)]
+        expected = 0.0
+        half = Robot.world_size / 2.0
+        for p in particles:
+            d_x = (p.x - robot.x + half) % Robot.world_size - half
+            d_y = (p.y - robot.y + half) % Robot.world_size - half
+            expected += sqrt(d_x * d_x + d_y * d_y)
+        expected /= len(particles)
+        self.assertAlmostEqual(robot_eval(robot, particles), expected)
+        self.assertAlmostEqual(robot_eval(robot, ParticleSet.from_robots(particles)), expected)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.fast_math import NoiseConstants, TrigTable
+from robot_localization.filters.particle_filter import ParticleFilter
+
+LANDMARKS = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+
+
+class TestFastMath(unittest.TestCase):
+
+    def test_table_accuracy(self):
+        print("\n[!] Trig table accuracy testing..")
+        angles = np.random.default_rng(50).uniform(-10.0, 10.0, 100000)
+        trig = TrigTable()
+        sin, cos = trig.sin_cos(angles)
+        self.assertLessEqual(np.max(np.abs(sin - np.sin(angles))), trig.max_error)
+        self.assertLessEqual(np.max(np.abs(cos - np.cos(angles))), trig.max_error)
+        with self.assertRaises(ValueError):
+            TrigTable(1000)
+        print("[*] Test done")
+
+    def test_fused_kernel(self):
+        print("\n[!] Fused log likelihood testing..")
+        rng = np.random.default_rng(52)
+        x, y = rng.uniform(0.0, 100.0, (2, 500))
+        z = [30.0, 50.0, 55.0, 30.0]
+        expected = models.log_likelihood(x, y, LANDMARKS, z, 2.0)
+        self.assertTrue(np.array_equal(NoiseConstants(0.1, 0.1, 2.0).log_likelihood(x, y, LANDMARKS, z),
+                                       expected))
+        self.assertTrue(np.allclose(
+            NoiseConstants(0.1, 0.1, 2.0, True).log_likelihood(x, y, LANDMARKS, z), expected))
+        with self.assertRaises(ValueError):
+            NoiseConstants(0.1, 0.1, 2.0, True).log_likelihood(x, y, LANDMARKS, z[:3])
+        with self.assertRaises(ValueError):
+            NoiseConstants(0.1, 0.1, 0.0).log_likelihood(x, y, LANDMARKS, z)
+        with self.assertRaises(ValueError):
+            NoiseConstants(0.1, 0.1, 2.0).log_likelihood(x, y, LANDMARKS, z[:3])
+        pf = ParticleFilter(100, 100.0, LANDMARKS, rng=np.random.default_rng(56))
+        pf.set_noise(0.1, 0.1, 2.0)
+        with self.assertRaises(ValueError):
+            pf.extract_weights([10.0, 20.0, 30.0])
+        print("[*] Test done")
+
+    def test_constants_invalidation(self):
+        print("\n[!] Noise constants cache testing..")
+        pf = ParticleFilter(100, 100.0, LANDMARKS, rng=np.random.default_rng(53))
+        pf.set_noise(0.1, 0.1, 2.0)
+        constants = pf.constants
+        self.assertIs(pf.constants, constants)
+        pf.set_noise(0.1, 0.1, 3.0)
+        self.assertIsNot(pf.constants, constants)
+        self.assertEqual(pf.constants.key[2], 3.0)
+        pf.fast_math = True
+        trig = pf.constants.trig
+        self.assertIsNotNone(trig)
+        pf.set_noise(0.2, 0.3, 3.0)
+        self.assertIs(pf.constants.trig, trig)
+        self.assertIs(NoiseConstants(0.5, 0.5, 1.0, True).trig, trig)
+        print("[*] Test done")
+
+    def test_fast_mode_matches_exact(self):
+        print("\n[!] Fast-math filter testing..")
+        estimates = []
+        for fast_math in (False, True):
+            pf = ParticleFilter(2000, 100.0, LANDMARKS, rng=np.random.default_rng(54),
+                                fast_math=fast_math)
+            pf.set_noise(0.05, 0.05, 5.0)
+            rng = np.random.default_rng(55)
+            x, y, orientation = np.array([40.0]), np.array([35.0]), np.array([0.5])
+            for t in range(10):
+                models.move(x, y, orientation, 0.1, 5.0, 0.0, 0.0, 100.0, rng)
+                z = models.landmark_distances(x, y, LANDMARKS)[0] + rng.normal(0.0, 1.0, 4)
+                pf.filter(0.1, 5.0, z)
+            estimates.append(pf.estimate())
+        for estimate in estimates:
+            self.assertLess(np.hypot(estimate[0] - x[0], estimate[1] - y[0]), 3.0)
+        self.assertLess(np.hypot(estimates[0][0] - estimates[1][0],
+                                 estimates[0][1] - estimates[1][1]), 0.5)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
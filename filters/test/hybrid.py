@@ -0,0 +1,70 @@
+#pylint: disable-all
+import os
+import tempfile
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.checkpoint import ReplayLog, replay
+from robot_localization.filters.hybrid import HybridLocalizer, GLOBAL, TRACKING
+from robot_localization.filters.particle_filter import ParticleFilter
+
+LANDMARKS = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+
+
+class TestHybrid(unittest.TestCase):
+
+    def test_reseed(self):
+        print("\n[!] Particle reseed testing..")
+        pf = ParticleFilter(1000, 100.0, LANDMARKS, rng=np.random.default_rng(41))
+        pf.reseed([50.0, 99.5, 1.0], np.diag([1.0, 1.0, 0.01]), 2000, uniform_fraction=0.1)
+        self.assertEqual(len(pf.particles), 2000)
+        self.assertEqual(pf.particle_count, 2000)
+        self.assertTrue(np.all((pf.particles.y >= 0.0) & (pf.particles.y < 100.0)))
+        mean = pf.estimate()
+        self.assertLess(abs(mean[0] - 50.0), 1.0)
+
+        # without a uniform share only the gaussian samples are drawn
+        pf = ParticleFilter(10, 100.0, LANDMARKS, rng=np.random.default_rng(44))
+        expected = np.random.default_rng(44)
+        expected.random((3, 10))
+        expected.multivariate_normal([50.0, 50.0, 1.0], np.eye(3), 20, method='eigh')
+        pf.reseed([50.0, 50.0, 1.0], np.eye(3), 20)
+        self.assertEqual(pf.rng.random(), expected.random())
+        print("[*] Test done")
+
+    def test_hand_off_and_recovery(self):
+        print("\n[!] Hybrid switching testing..")
+        def make_hybrid():
+            pf = ParticleFilter(3000, 100.0, LANDMARKS, rng=np.random.default_rng(43))
+            pf.set_noise(0.1, 0.02, 1.0)
+            return HybridLocalizer(pf, converge_std=1.5)
+
+        rng = np.random.default_rng(42)
+        hybrid = make_hybrid()
+        x, y, orientation = np.array([40.0]), np.array([35.0]), np.array([0.5])
+        modes = []
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        log = os.path.join(directory.name, 'hybrid.log')
+        with ReplayLog(log) as hybrid.replay_log:
+            for t in range(60):
+                if t == 30:
+                    x[:], y[:] = 65.0, 60.0
+                models.move(x, y, orientation, 0.1, 3.0, 0.02, 0.1, 100.0, rng)
+                z = models.landmark_distances(x, y, LANDMARKS)[0] + rng.normal(0.0, 1.0, 4)
+                mean = hybrid.filter(0.1, 3.0, z)
+                modes.append(hybrid.mode)
+        self.assertIn(TRACKING, modes[:30])
+        self.assertIn(GLOBAL, modes[30:36])
+        self.assertEqual(hybrid.mode, TRACKING)
+        self.assertLess(np.hypot(mean[0] - x[0], mean[1] - y[0]), 2.0)
+
+        replayed = replay(make_hybrid(), log)
+        self.assertEqual(replayed.step_count, 60)
+        self.assertEqual(replayed.mode, TRACKING)
+        self.assertEqual(replayed.estimate(), hybrid.estimate())
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.kalman import ExtendedKalmanFilter, UnscentedKalmanFilter
+from robot_localization.filters.particle_filter import ParticleFilter
+
+LANDMARKS = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+
+
+def track(localizer, steps=40, seed=29):
+    rng = np.random.default_rng(seed)
+    x, y, orientation = np.array([40.0]), np.array([35.0]), np.array([0.5])
+    errors = []
+    for t in range(steps):
+        models.move(x, y, orientation, 0.1, 3.0, 0.02, 0.1, 100.0, rng)
+        z = models.landmark_distances(x, y, LANDMARKS)[0] + rng.normal(0.0, 1.0, 4)
+        localizer.filter(0.1, 3.0, z)
+        mean = localizer.estimate()
+        errors.append(np.hypot(mean[0] - x[0], mean[1] - y[0]))
+    return errors
+
+
+class TestKalman(unittest.TestCase):
+
+    def test_tracking(self):
+        print("\n[!] EKF / UKF tracking testing..")
+        for backend in (ExtendedKalmanFilter, UnscentedKalmanFilter):
+            localizer = backend([41.0, 34.0, 0.45], np.diag([4.0, 4.0, 0.05]), 100.0, LANDMARKS)
+            localizer.set_noise(0.1, 0.02, 1.0)
+            errors = track(localizer)
+            self.assertLess(np.mean(errors[10:]), 1.5, backend.__name__)
+            cov = localizer.covariance()
+            self.assertTrue(np.allclose(cov, cov.T))
+            self.assertTrue(np.all(np.linalg.eigvalsh(cov) > 0))
+        print("[*] Test done")
+
+    def test_swappable_backends(self):
+        print("\n[!] Backend API testing..")
+        pf = ParticleFilter(3000, 100.0, LANDMARKS, rng=np.random.default_rng(30))
+        ekf = ExtendedKalmanFilter([40.0, 35.0, 0.5], np.diag([1.0, 1.0, 0.01]), 100.0, LANDMARKS)
+        for localizer in (pf, ekf):
+            localizer.set_noise(0.1, 0.02, 1.0)
+            localizer.predict(0.1, 3.0)
+            localizer.update([30.0, 50.0, 55.0, 30.0])
+            self.assertEqual(len(localizer.estimate()), 3)
+            self.assertEqual(localizer.covariance().shape, (3, 3))
+        with self.assertRaises(ValueError):
+            ekf.predict(0.0, -1.0)
+        for localizer in (ekf, UnscentedKalmanFilter([40.0, 35.0, 0.5], np.diag([1.0, 1.0, 0.01]),
+                                                     100.0, LANDMARKS)):
+            localizer.set_noise(0.1, 0.02, 1.0)
+            mean = localizer.mean.copy()
+            with self.assertRaises(ValueError):
+                localizer.update(np.array([40.0]))
+            with self.assertRaises(ValueError):
+                localizer.update([40.0, 30.0], landmark_ids=[1])
+            self.assertTrue(np.array_equal(localizer.mean, mean))
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
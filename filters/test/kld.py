@@ -0,0 +1,41 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.kld import KLDSampler, kld_sample_size
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.filters.particle_set import ParticleSet
+
+class TestKLD(unittest.TestCase):
+
+    def test_sample_size(self):
+        print("\n[!] kld_sample_size testing..")
+        sizes = kld_sample_size([1, 2, 10, 100, 1000])
+        self.assertEqual(sizes[0], 1)
+        self.assertTrue(np.all(np.diff(sizes) > 0))
+        self.assertTrue(1000 < sizes[3] < 2000)
+        print("[*] Test done")
+
+    def test_adaptive_count(self):
+        print("\n[!] KLDSampler particle count testing..")
+        rng = np.random.default_rng(11)
+        sampler = KLDSampler(min_count=200, max_count=50000)
+        spread = ParticleSet.uniform(50000, 100.0, rng)
+        converged = ParticleSet(np.full(50000, 10.0), np.full(50000, 20.0), np.full(50000, 1.0))
+        self.assertEqual(len(sampler.sample(converged, 100.0, rng)), 200)
+        self.assertEqual(len(sampler.sample(spread, 100.0, rng)), 50000)
+        print("[*] Test done")
+
+    def test_particle_filter_shrinks(self):
+        print("\n[!] ParticleFilter KLD testing..")
+        pf = ParticleFilter(particle_count=20000, rng=np.random.default_rng(12),
+                            kld=KLDSampler(min_count=100, max_count=20000), ess_threshold=1.0)
+        pf.set_noise(0.05, 0.05, 2.0)
+        for t in range(5):
+            pf.filter(0.1, 5.0, [30.0, 60.0, 50.0, 40.0])
+        self.assertLess(pf.particle_count, 20000)
+        self.assertEqual(len(pf.particles), pf.particle_count)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.metrics import FilterMetrics, NULL_METRICS
+from robot_localization.filters.particle_filter import ParticleFilter
+
+class TestMetrics(unittest.TestCase):
+
+    def test_stage_metrics(self):
+        print("\n[!] FilterMetrics testing..")
+        snapshots = []
+        metrics = FilterMetrics(exporters=[snapshots.append])
+        pf = ParticleFilter(1000, rng=np.random.default_rng(27), metrics=metrics, ess_threshold=1.0)
+        pf.set_noise(0.05, 0.05, 5.0)
+        for t in range(3):
+            pf.filter(0.1, 5.0, [30.0, 60.0, 50.0, 40.0])
+        pf.estimate()
+        snapshot = metrics.snapshot()
+        self.assertEqual(len(snapshots), 3)
+        self.assertEqual(set(snapshot['stages']), {'motion', 'weighting', 'resampling', 'estimation'})
+        self.assertEqual(snapshot['stages']['motion']['calls'], 3)
+        self.assertEqual(snapshot['counters']['resample_count'], 3)
+        self.assertEqual(snapshot['counters']['cycles'], 3)
+        self.assertEqual(snapshot['counters']['particles'], 1000)
+        self.assertIn('weight_underflows', snapshot['counters'])
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {'stages': {}, 'counters': {}})
+        print("[*] Test done")
+
+    def test_disabled(self):
+        print("\n[!] NullMetrics testing..")
+        pf = ParticleFilter(100, rng=np.random.default_rng(28))
+        self.assertIs(pf.metrics, NULL_METRICS)
+        pf.set_noise(0.05, 0.05, 5.0)
+        pf.filter(0.1, 5.0, [30.0, 60.0, 50.0, 40.0])
+        self.assertEqual(NULL_METRICS.snapshot(), {'stages': {}, 'counters': {}})
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
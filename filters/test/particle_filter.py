@@ -0,0 +1,95 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.robot import Robot
+
+class TestParticleFilter(unittest.TestCase):
+
+    def test_move_particles(self):
+        print("\n[!] ParticleFilter.move_particles testing..")
+        pf = ParticleFilter(particle_count=50, rng=np.random.default_rng(3))
+        robots = [pf.get_particle(i) for i in range(50)]
+        pf.move_particles(0.1, 5.0)
+        for i, r in enumerate(robots):
+            moved = r.move(0.1, 5.0)
+            self.assertAlmostEqual(pf.particles.x[i], moved.x)
+            self.assertAlmostEqual(pf.particles.y[i], moved.y)
+            self.assertAlmostEqual(pf.particles.orientation[i], moved.orientation)
+        with self.assertRaises(ValueError):
+            pf.move_particles(0.0, -1.0)
+        print("[*] Test done")
+
+    def test_move_particles_noise(self):
+        print("\n[!] ParticleFilter.move_particles noise testing..")
+        pf = ParticleFilter(particle_count=20000, rng=np.random.default_rng(4))
+        pf.set_noise(0.5, 0.05, 5.0)
+        before = pf.particles.orientation.copy()
+        pf.move_particles(0.0, 0.0)
+        turned = (pf.particles.orientation - before + np.pi) % (2 * np.pi) - np.pi
+        self.assertAlmostEqual(turned.std(), 0.05, places=2)
+        self.assertTrue(np.all(pf.particles.x < pf.world_size))
+        print("[*] Test done")
+
+    def test_extract_weights(self):
+        print("\n[!] ParticleFilter.extract_weights testing..")
+        pf = ParticleFilter(particle_count=30, rng=np.random.default_rng(5))
+        pf.set_noise(0.05, 0.05, 5.0)
+        z = [10.0, 50.0, 40.0, 30.0]
+        log_w = pf.extract_weights(z)
+        expected = np.array([pf.get_particle(i).measurement_prob(z) for i in range(30)])
+        expected /= expected.sum()
+        self.assertTrue(np.allclose(np.exp(log_w), expected))
+        self.assertTrue(np.allclose(pf.particles.weights, expected))
+        print("[*] Test done")
+
+    def test_extract_weights_many_landmarks(self):
+        print("\n[!] ParticleFilter.extract_weights underflow testing..")
+        rng = np.random.default_rng(6)
+        landmarks = rng.random((400, 2)) * 100.0
+        pf = ParticleFilter(particle_count=100, landmarks=landmarks, rng=rng)
+        pf.set_noise(0.05, 0.05, 1.0)
+        z = rng.random(400) * 100.0
+        log_w = pf.extract_weights(z)
+        self.assertTrue(np.all(np.isfinite(log_w)))
+        self.assertAlmostEqual(pf.particles.weights.sum(), 1.0)
+        print("[*] Test done")
+
+    def test_adaptive_resampling(self):
+        print("\n[!] ParticleFilter ESS resampling testing..")
+        pf = ParticleFilter(particle_count=1000, rng=np.random.default_rng(9), ess_threshold=0.5)
+        pf.set_noise(0.05, 0.05, 5.0)
+        pf.extract_weights([50.0, 50.0, 50.0, 50.0])
+        carried = pf.particles.weights.copy()
+        self.assertLess(pf.ess, 1000)
+        self.assertAlmostEqual(pf.ess, 1.0 / np.sum(carried ** 2))
+
+        pf.ess_threshold = 0.0
+        pf.set_noise(0.0, 0.0, 1e6)
+        particles = pf.filter(0.0, 0.0, [50.0, 50.0, 50.0, 50.0])
+        self.assertTrue(np.allclose(particles.weights, carried))
+
+        pf.ess_threshold = 1.0
+        particles = pf.filter(0.0, 0.0, [50.0, 50.0, 50.0, 50.0])
+        self.assertTrue(np.allclose(particles.weights, 1.0 / 1000))
+        self.assertEqual(pf.ess, 1000)
+        print("[*] Test done")
+
+    def test_filter_converges(self):
+        print("\n[!] ParticleFilter.filter testing..")
+        rng = np.random.default_rng(10)
+        robot = Robot()
+        robot.set(30.0, 40.0, 0.5)
+        pf = ParticleFilter(particle_count=3000, rng=rng)
+        pf.set_noise(0.05, 0.05, 5.0)
+        for t in range(10):
+            robot = robot.move(0.1, 5.0)
+            particles = pf.filter(0.1, 5.0, robot.sense())
+        error = np.hypot(np.average(particles.x, weights=particles.weights) - robot.x,
+                         np.average(particles.y, weights=particles.weights) - robot.y)
+        self.assertLess(error, 5.0)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
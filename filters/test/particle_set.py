@@ -0,0 +1,105 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.particle_set import ParticleBuffer, ParticleSet
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.robot import Robot
+
+class TestParticleSet(unittest.TestCase):
+
+    def test_uniform(self):
+        print("\n[!] ParticleSet.uniform testing..")
+        ps = ParticleSet.uniform(500, 100.0, np.random.default_rng(1))
+        self.assertEqual(len(ps), 500)
+        self.assertTrue(ps.x.flags['C_CONTIGUOUS'])
+        self.assertTrue(np.all((ps.x >= 0) & (ps.x < 100.0)))
+        self.assertTrue(np.all((ps.orientation >= 0) & (ps.orientation < 2 * np.pi)))
+        self.assertAlmostEqual(ps.weights.sum(), 1.0)
+        with self.assertRaises(ValueError):
+            ParticleSet.uniform(0, 100.0)
+        print("[*] Test done")
+
+    def test_robot_view(self):
+        print("\n[!] ParticleSet robot view testing..")
+        r = Robot()
+        r.set(10.0, 20.0, 1.0)
+        ps = ParticleSet.from_robots([r, r])
+        view = ps.get_robot(1, (0.1, 0.2, 0.3))
+        self.assertEqual((view.x, view.y, view.orientation), (10.0, 20.0, 1.0))
+        self.assertEqual(view.sense_noise, 0.3)
+        view.x = 0.0
+        self.assertEqual(ps.x[1], 10.0)
+        print("[*] Test done")
+
+    def test_select(self):
+        print("\n[!] ParticleSet.select testing..")
+        ps = ParticleSet([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [0.1, 0.2, 0.3], [0.2, 0.3, 0.5])
+        picked = ps.select([2, 2, 0])
+        self.assertEqual(picked.x.tolist(), [3.0, 3.0, 1.0])
+        self.assertEqual(picked.y.tolist(), [6.0, 6.0, 4.0])
+        self.assertTrue(np.allclose(picked.weights, 1.0 / 3))
+        print("[*] Test done")
+
+    def test_particle_filter(self):
+        print("\n[!] ParticleFilter particle set testing..")
+        pf = ParticleFilter(particle_count=200, rng=np.random.default_rng(2))
+        self.assertEqual(len(pf.particles), 200)
+        self.assertEqual(pf.landmarks.shape, (len(Robot.landmarks), 2))
+        self.assertIsInstance(pf.get_particle(0), Robot)
+        print("[*] Test done")
+
+    def test_double_buffer(self):
+        print("\n[!] ParticleBuffer testing..")
+        ps = ParticleSet.uniform(100, 100.0, np.random.default_rng(3))
+        buffer = ParticleBuffer(100)
+        buffers = {buffer.front.ctypes.data, buffer.back.ctypes.data}
+        indices = np.random.default_rng(4).integers(0, 100, 100)
+        expected = ps.select(indices)
+        picked = buffer.select(ps, indices)
+        self.assertTrue(np.array_equal(picked.x, expected.x))
+        self.assertTrue(np.array_equal(picked.orientation, expected.orientation))
+        self.assertTrue(np.allclose(picked.weights, 0.01))
+        for _ in range(5):
+            before = picked.x.copy()
+            again = buffer.select(picked, indices)
+            self.assertTrue(np.array_equal(again.x, before[indices]))
+            picked = again
+        self.assertEqual({buffer.front.ctypes.data, buffer.back.ctypes.data}, buffers)
+        self.assertEqual(picked.x.ctypes.data, buffer.front.ctypes.data)
+
+        grown = buffer.select(picked, np.arange(250) % 100)
+        self.assertEqual(len(grown), 250)
+        self.assertTrue(np.array_equal(grown.x[100:200], picked.x))
+        print("[*] Test done")
+
+    def test_filter_reuses_buffers(self):
+        print("\n[!] ParticleFilter in-place resample testing..")
+        pf = ParticleFilter(particle_count=300, rng=np.random.default_rng(5))
+        pf.set_noise(0.05, 0.05, 5.0)
+        pf.filter(0.1, 5.0, [50.0, 50.0, 50.0, 50.0])
+        pf.resample()
+        pf.resample()
+        buffers = {pf.buffer.front.ctypes.data, pf.buffer.back.ctypes.data}
+        for _ in range(4):
+            pf.resample()
+            self.assertEqual(pf.particles.x.ctypes.data, pf.buffer.front.ctypes.data)
+        self.assertEqual({pf.buffer.front.ctypes.data, pf.buffer.back.ctypes.data}, buffers)
+        print("[*] Test done")
+
+    def test_filter_result_lifetime(self):
+        print("\n[!] ParticleFilter.filter result lifetime testing..")
+        pf = ParticleFilter(particle_count=300, rng=np.random.default_rng(6), ess_threshold=1.0)
+        pf.set_noise(0.05, 0.05, 5.0)
+        live = pf.filter(0.1, 5.0, [50.0, 50.0, 50.0, 50.0])
+        kept = live.copy()
+        pf.filter(0.1, 5.0, [50.0, 50.0, 50.0, 50.0])
+        pf.filter(0.1, 5.0, [50.0, 50.0, 50.0, 50.0])
+        # the live set shares the double buffer and was overwritten, the copy was not
+        self.assertTrue(np.shares_memory(live.x, pf.particles.x))
+        self.assertFalse(np.array_equal(live.x, kept.x))
+        self.assertFalse(np.shares_memory(kept.x, pf.particles.x))
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
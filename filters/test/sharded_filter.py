@@ -0,0 +1,63 @@
+#pylint: disable-all
+import gc
+import unittest
+from multiprocessing import shared_memory
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.sharded_filter import ShardedParticleFilter
+
+class TestShardedParticleFilter(unittest.TestCase):
+
+    def test_sharded_filter(self):
+        print("\n[!] ShardedParticleFilter testing..")
+        landmarks = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+        with ShardedParticleFilter(6000, workers=3, landmarks=landmarks, seed=17,
+                                   ess_threshold=1.0) as pf:
+            pf.set_noise(0.05, 0.05, 2.0)
+            x, y, orientation = np.array([35.0]), np.array([45.0]), np.array([0.3])
+            for t in range(8):
+                models.move(x, y, orientation, 0.1, 5.0, 0.0, 0.0, 100.0, pf.rng)
+                pf.filter(0.1, 5.0, models.landmark_distances(x, y, landmarks)[0])
+                self.assertEqual(pf.ess, 6000)
+            particles = pf.particles
+            self.assertEqual(len(particles), 6000)
+            self.assertAlmostEqual(particles.weights.sum(), 1.0)
+            self.assertLess(np.hypot(particles.x.mean() - x[0], particles.y.mean() - y[0]), 3.0)
+            with self.assertRaises(ValueError):
+                pf.filter(0.0, -1.0, [0.0] * 4)
+        self.assertIsNone(pf.memory)
+        print("[*] Test done")
+
+    def assertReleased(self, name):
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_worker_errors(self):
+        print("\n[!] ShardedParticleFilter error handling testing..")
+        landmarks = np.array([[20.0, 20.0], [80.0, 70.0]])
+        with ShardedParticleFilter(100, workers=2, landmarks=landmarks, seed=18) as pf:
+            pf.set_noise(0.05, 0.05, 2.0)
+            with self.assertRaises(ValueError):
+                pf.filter(0.1, 1.0, [10.0, 20.0, 30.0])
+            with self.assertRaises(IndexError):
+                pf.filter(0.1, 1.0, [10.0], landmark_ids=[5])
+            pf.filter(0.1, 1.0, [10.0, 20.0])
+            self.assertTrue(all(process.is_alive() for process in pf.processes))
+
+        pf = ShardedParticleFilter(100, workers=2, landmarks=landmarks, seed=19)
+        name = pf.memory.name
+        pf.processes[0].kill()
+        pf.processes[0].join()
+        pf.close()
+        self.assertReleased(name)
+
+        pf = ShardedParticleFilter(100, workers=2, landmarks=landmarks, seed=20)
+        name = pf.memory.name
+        del pf
+        gc.collect()
+        self.assertReleased(name)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#pylint: disable-all
+import asyncio
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.filters.streaming import (Odometry, RangeMeasurement, localize,
+                                                  localize_async)
+
+LANDMARKS = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+
+
+def simulate(steps):
+    rng = np.random.default_rng(18)
+    x, y, orientation = np.array([40.0]), np.array([30.0]), np.array([0.2])
+    odometry, measurements = [], []
+    for t in range(steps):
+        models.move(x, y, orientation, 0.05, 2.0, 0.0, 0.0, 100.0, rng)
+        odometry.append(Odometry(t * 0.1, 0.05, 2.0))
+        if t % 3 == 2:
+            z = models.landmark_distances(x, y, LANDMARKS)[0]
+            measurements.append(RangeMeasurement(t * 0.1 + 0.05, z))
+    return odometry, measurements, (x[0], y[0])
+
+
+def make_filter():
+    pf = ParticleFilter(3000, landmarks=LANDMARKS, rng=np.random.default_rng(19))
+    pf.set_noise(0.05, 0.02, 2.0)
+    return pf
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_localize(self):
+        print("\n[!] Streaming localize testing..")
+        odometry, measurements, truth = simulate(30)
+        estimates = list(localize(make_filter(), iter(odometry), iter(measurements)))
+        self.assertEqual(len(estimates), len(measurements))
+        self.assertEqual([e.timestamp for e in estimates], [m.timestamp for m in measurements])
+        self.assertLess(np.hypot(estimates[-1].x - truth[0], estimates[-1].y - truth[1]), 6.0)
+        print("[*] Test done")
+
+    def test_localize_async(self):
+        print("\n[!] Streaming localize_async testing..")
+        odometry, measurements, truth = simulate(30)
+
+        async def stream(readings):
+            for reading in readings:
+                await asyncio.sleep(0)
+                yield reading
+
+        async def collect():
+            return [e async for e in localize_async(make_filter(), stream(odometry),
+                                                    stream(measurements), maxsize=2)]
+
+        estimates = asyncio.run(collect())
+        expected = list(localize(make_filter(), iter(odometry), iter(measurements)))
+        self.assertEqual(estimates, expected)
+        print("[*] Test done")
+
+    def test_localize_async_stream_error(self):
+        print("\n[!] Streaming localize_async error testing..")
+        odometry, measurements, truth = simulate(10)
+
+        async def failing(readings):
+            for reading in readings[:3]:
+                await asyncio.sleep(0)
+                yield reading
+            raise RuntimeError('sensor failure')
+
+        async def stream(readings):
+            for reading in readings:
+                await asyncio.sleep(0)
+                yield reading
+
+        async def collect():
+            return [e async for e in localize_async(make_filter(), failing(odometry),
+                                                    stream(measurements), maxsize=2)]
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(collect())
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Free space sampler: draws particles only from the free cells of an occupancy grid
+"""
+from math import pi
+
+import numpy as np
+
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.planning.grid import OccupancyGrid
+from robot_localization.utils.rng import make_rng
+
+
+class FreeSpaceSampler(object):
+    """
+    Precomputes the flat index of every free cell of an OccupancyGrid.
+    Cell (row, col) covers x in [col, col + 1) * cell_size and
+    y in [row, row + 1) * cell_size. All cells have the same area, so a
+    uniform draw over free space is one integer index into the free cell
+    array plus a uniform offset inside the cell, O(1) per particle.
+    """
+
+    def __init__(self, grid: OccupancyGrid, cell_size=1.0):
+        if cell_size <= 0:
+            raise ValueError('Cell size must be greater than 0.')
+        self.cell_size = float(cell_size)
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.free = grid.to_array().ravel() == 0
+        self.free_cells = np.flatnonzero(self.free)
+        if len(self.free_cells) == 0:
+            raise ValueError('The grid has no free cells.')
+
+    @property
+    def free_area(self):
+        return len(self.free_cells) * self.cell_size ** 2
+
+    def sample(self, count, rng=None):
+        """
+        Returns count particles spread uniformly over the free cells,
+        the map aware counterpart of ParticleSet.uniform
+        """
+        if count <= 0:
+            raise ValueError("Particle count must be greater than 0.")
+        rng = make_rng(rng)
+        cells = self.free_cells[rng.integers(0, len(self.free_cells), count)]
+        row, col = np.divmod(cells, self.cols)
+        offsets = rng.random((3, count))
+        offsets[0] += col
+        offsets[0] *= self.cell_size
+        offsets[1] += row
+        offsets[1] *= self.cell_size
+        offsets[2] *= 2.0 * pi
+        return ParticleSet(offsets[0], offsets[1], offsets[2])
+
+    def contains(self, x, y):
+        """
+        Returns a boolean array that is True where (x, y) lies in a free cell
+        """
+        col = np.floor_divide(x, self.cell_size).astype(np.intp)
+        row = np.floor_divide(y, self.cell_size).astype(np.intp)
+        inside = (row >= 0) & (row < self.rows) & (col >= 0) & (col < self.cols)
+        result = np.zeros(np.shape(x), dtype=bool)
+        result[inside] = self.free[row[inside] * self.cols + col[inside]]
+        return result
@@ -0,0 +1,121 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Landmark map with a uniform grid index for range limited sensing
+"""
+from math import floor, inf
+
+import numpy as np
+
+
+class LandmarkMap(object):
+    """
+    Holds the landmarks of a world as an (M, 2) array and indexes them
+    with a uniform grid, so that only the cells around a position need to
+    be scanned to find the landmarks within sensor range.
+    The grid is stored CSR style: landmark indices sorted by cell and the
+    start offset of every occupied cell.
+    """
+
+    def __init__(self, landmarks, sensor_range=inf, cell_size=None):
+        self.landmarks = np.asarray(landmarks, dtype=np.float64).reshape(-1, 2)
+        if len(self.landmarks) == 0:
+            raise ValueError("Landmarks size needs to be greater than zero.")
+        if sensor_range <= 0:
+            raise ValueError("Sensor range must be greater than 0.")
+        self.sensor_range = float(sensor_range)
+
+        if cell_size is None:
+            if np.isfinite(self.sensor_range):
+                cell_size = self.sensor_range
+            else:
+                span = np.ptp(self.landmarks, axis=0).max()
+                cell_size = span if span > 0 else 1.0
+        if cell_size <= 0:
+            raise ValueError("Cell size must be greater than 0.")
+        self.cell_size = float(cell_size)
+
+        cells = np.floor(self.landmarks / self.cell_size).astype(np.int64)
+        self.cell_origin = cells.min(axis=0)
+        self.grid_shape = tuple(cells.max(axis=0) - self.cell_origin + 1)
+        keys = self._keys(cells[:, 0], cells[:, 1])
+
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_starts = np.unique(keys[self.order], return_index=True)
+        self.cell_ends = np.append(self.cell_starts[1:], len(keys))
+
+    def _keys(self, cell_x, cell_y):
+        return (cell_x - self.cell_origin[0]) * self.grid_shape[1] + (cell_y - self.cell_origin[1])
+
+    def __len__(self):
+        return len(self.landmarks)
+
+    def query_box(self, x_min, y_min, x_max, y_max):
+        """
+        Returns the indices of the landmarks in grid cells that overlap the box.
+        This is a superset of the landmarks inside the box.
+        """
+        lows = np.array([floor(x_min / self.cell_size), floor(y_min / self.cell_size)])
+        highs = np.array([floor(x_max / self.cell_size), floor(y_max / self.cell_size)])
+        lows = np.maximum(lows, self.cell_origin)
+        highs = np.minimum(highs, self.cell_origin + np.array(self.grid_shape) - 1)
+        if np.any(highs < lows):
+            return np.empty(0, dtype=np.intp)
+
+        cell_x, cell_y = np.meshgrid(np.arange(lows[0], highs[0] + 1),
+                                     np.arange(lows[1], highs[1] + 1), indexing='ij')
+        keys = self._keys(cell_x.ravel(), cell_y.ravel())
+        found = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        found = found[self.cell_keys[found] == keys]
+        if len(found) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        starts = self.cell_starts[found]
+        lengths = self.cell_ends[found] - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return self.order[np.repeat(starts, lengths) + offsets]
+
+    def query(self, x, y, radius=None):
+        """
+        Returns the sorted indices of the landmarks within radius of (x, y).
+        radius defaults to the sensor range.
+        """
+        if radius is None:
+            radius = self.sensor_range
+        if not np.isfinite(radius):
+            return np.arange(len(self.landmarks))
+        candidates = self.query_box(x - radius, y - radius, x + radius, y + radius)
+        points = self.landmarks[candidates]
+        inside = np.hypot(points[:, 0] - x, points[:, 1] - y) <= radius
+        return np.sort(candidates[inside])
+
+    def sense(self, x, y, sense_noise, rng):
+        """
+        Simulates a range limited sensor at (x, y) like Robot.sense does.
+        Returns the indices of the visible landmarks and their noisy distances.
+        """
+        visible = self.query(x, y)
+        points = self.landmarks[visible]
+        distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+        distances += rng.normal(0.0, sense_noise, len(visible))
+        return visible, distances
@@ -0,0 +1,104 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Binary on-disk format for landmark maps, occupancy grids and particle snapshots.
+Every file is a plain .npy file, so loading goes through memory mapping:
+big maps open without parsing and several processes share the pages read-only.
+
+    landmarks   float64 (M, 2)
+    grid        uint8 (rows, cols), non zero for blocked cells
+    particles   float64 (4, N), rows are x, y, orientation and weights
+"""
+import numpy as np
+
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.maps.landmark_map import LandmarkMap
+from robot_localization.planning.grid import OccupancyGrid
+
+
+def _load(path, mmap, dtype, ndim):
+    values = np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False)
+    if values.dtype != dtype or values.ndim != ndim:
+        raise ValueError('%s does not hold a %d-dim %s array' % (path, ndim, np.dtype(dtype)))
+    return values
+
+
+def save_landmarks(path, landmarks):
+    """
+    Saves landmarks as a float64 (M, 2) array
+    """
+    np.save(path, np.asarray(landmarks, dtype=np.float64).reshape(-1, 2), allow_pickle=False)
+
+
+def load_landmarks(path, mmap=True):
+    """
+    Loads landmarks saved by save_landmarks, memory mapped read-only by default
+    """
+    landmarks = _load(path, mmap, np.float64, 2)
+    if landmarks.shape[1] != 2:
+        raise ValueError('%s does not hold (M, 2) landmarks' % path)
+    return landmarks
+
+
+def load_landmark_map(path, sensor_range=np.inf, cell_size=None, mmap=True):
+    """
+    Loads landmarks saved by save_landmarks into a LandmarkMap,
+    the map keeps using the memory mapped array
+    """
+    return LandmarkMap(load_landmarks(path, mmap), sensor_range, cell_size)
+
+
+def save_grid(path, grid):
+    """
+    Saves an OccupancyGrid, or a 2-dim array of cells, as a uint8 (rows, cols) array
+    """
+    if isinstance(grid, OccupancyGrid):
+        grid = grid.to_array()
+    np.save(path, np.asarray(grid, dtype=np.uint8), allow_pickle=False)
+
+
+def load_grid(path, mmap=True):
+    """
+    Loads the cells saved by save_grid as a uint8 (rows, cols) array,
+    memory mapped read-only by default. Use OccupancyGrid.from_rows to plan on it.
+    """
+    return _load(path, mmap, np.uint8, 2)
+
+
+def save_particles(path, particles: ParticleSet):
+    """
+    Saves a snapshot of the particle set as a float64 (4, N) array
+    """
+    np.save(path, np.stack((particles.x, particles.y, particles.orientation,
+                            particles.weights)), allow_pickle=False)
+
+
+def load_particles(path, mmap=True) -> ParticleSet:
+    """
+    Loads a particle snapshot saved by save_particles. With mmap the particle
+    set views the read-only file, call copy() on it to get a writable set.
+    """
+    values = _load(path, mmap, np.float64, 2)
+    if values.shape[0] != 4:
+        raise ValueError('%s does not hold a (4, N) particle snapshot' % path)
+    return ParticleSet(values[0], values[1], values[2], values[3])
@@ -0,0 +1,90 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.metrics import FilterMetrics
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.maps.free_space import FreeSpaceSampler
+from robot_localization.planning.grid import OccupancyGrid
+
+LANDMARKS = np.array([[20.0, 20.0], [80.0, 70.0], [30.0, 90.0], [60.0, 10.0]])
+
+
+def walled_grid():
+    # 10 x 10 cells of 10 units, the left half and the bottom row are walls
+    cells = np.zeros((10, 10), dtype=np.uint8)
+    cells[:, :5] = 1
+    cells[0, :] = 1
+    return OccupancyGrid.from_rows(cells)
+
+
+class TestFreeSpace(unittest.TestCase):
+
+    def test_sampling(self):
+        print("\n[!] FreeSpaceSampler testing..")
+        sampler = FreeSpaceSampler(walled_grid(), 10.0)
+        self.assertEqual(len(sampler.free_cells), 45)
+        self.assertEqual(sampler.free_area, 4500.0)
+        particles = sampler.sample(20000, np.random.default_rng(60))
+        self.assertTrue(np.all(particles.x >= 50.0))
+        self.assertTrue(np.all(particles.y >= 10.0))
+        self.assertTrue(np.all(sampler.contains(particles.x, particles.y)))
+        counts = np.bincount((particles.y // 10 * 10 + particles.x // 10).astype(int), minlength=100)
+        self.assertLess(np.std(counts[counts > 0]) / np.mean(counts[counts > 0]), 0.1)
+        self.assertEqual(sampler.contains(np.array([5.0, 55.0, 150.0, -1.0]),
+                                          np.array([50.0, 50.0, 50.0, 50.0])).tolist(),
+                         [False, True, False, False])
+        with self.assertRaises(ValueError):
+            FreeSpaceSampler(OccupancyGrid.from_rows([[1, 1], [1, 1]]))
+        print("[*] Test done")
+
+    def test_augmented_injection(self):
+        print("\n[!] Map aware particle injection testing..")
+        sampler = FreeSpaceSampler(walled_grid(), 10.0)
+        metrics = FilterMetrics()
+        pf = ParticleFilter(2000, 100.0, LANDMARKS, rng=np.random.default_rng(61),
+                            free_space=sampler, alpha_slow=0.05, alpha_fast=0.5, metrics=metrics)
+        pf.set_noise(0.05, 0.05, 2.0)
+        self.assertTrue(np.all(sampler.contains(pf.particles.x, pf.particles.y)))
+
+        rng = np.random.default_rng(62)
+        x, y, orientation = np.array([70.0]), np.array([40.0]), np.array([1.5])
+        for t in range(30):
+            if t == 20:
+                x[:], y[:] = 90.0, 85.0
+            models.move(x, y, orientation, 0.0, 1.0, 0.0, 0.0, 100.0, rng)
+            z = models.landmark_distances(x, y, LANDMARKS)[0] + rng.normal(0.0, 1.0, 4)
+            pf.filter(0.0, 1.0, z)
+            if t == 19:
+                self.assertEqual(pf.injection_ratio(), 0.0)
+                self.assertLess(np.hypot(pf.estimate()[0] - x[0], pf.estimate()[1] - y[0]), 3.0)
+        self.assertGreater(metrics.counters['injected_particles'], 0)
+        estimate = pf.estimate()
+        self.assertLess(np.hypot(estimate[0] - x[0], estimate[1] - y[0]), 3.0)
+        print("[*] Test done")
+
+    def test_injection_many_landmarks(self):
+        print("\n[!] Injection with many landmarks testing..")
+        landmarks = np.random.default_rng(63).random((800, 2)) * 100.0
+        pf = ParticleFilter(500, 100.0, landmarks, rng=np.random.default_rng(64),
+                            alpha_slow=0.05, alpha_fast=0.5)
+        pf.set_noise(0.05, 0.05, 1.0)
+        rng = np.random.default_rng(65)
+        x, y = np.array([40.0]), np.array([60.0])
+        ratios = []
+        for t in range(8):
+            if t == 4:
+                x[:], y[:] = 80.0, 20.0
+            z = models.landmark_distances(x, y, landmarks)[0] + rng.normal(0.0, 1.0, 800)
+            pf.extract_weights(z)
+            ratios.append(pf.injection_ratio())
+        # the average likelihood is far below the smallest float64
+        self.assertLess(pf.log_w_slow, -745.0)
+        self.assertTrue(np.isfinite(pf.log_w_fast))
+        self.assertEqual(ratios[0], 0.0)
+        self.assertGreater(ratios[-1], 0.0)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.maps.landmark_map import LandmarkMap
+
+class TestLandmarkMap(unittest.TestCase):
+
+    def test_query(self):
+        print("\n[!] LandmarkMap.query testing..")
+        rng = np.random.default_rng(13)
+        landmarks = rng.random((3000, 2)) * 1000.0
+        lmap = LandmarkMap(landmarks, sensor_range=40.0)
+        for x, y in rng.random((50, 2)) * 1000.0:
+            expected = np.flatnonzero(np.hypot(landmarks[:, 0] - x, landmarks[:, 1] - y) <= 40.0)
+            self.assertEqual(lmap.query(x, y).tolist(), expected.tolist())
+        self.assertEqual(len(lmap.query(-500.0, -500.0)), 0)
+        print("[*] Test done")
+
+    def test_unlimited_range(self):
+        print("\n[!] LandmarkMap unlimited range testing..")
+        lmap = LandmarkMap([[20.0, 20.0], [80.0, 80.0]])
+        self.assertEqual(lmap.query(0.0, 0.0).tolist(), [0, 1])
+        with self.assertRaises(ValueError):
+            LandmarkMap([])
+        print("[*] Test done")
+
+    def test_range_limited_filter(self):
+        print("\n[!] ParticleFilter with LandmarkMap testing..")
+        rng = np.random.default_rng(14)
+        lmap = LandmarkMap(rng.random((500, 2)) * 100.0, sensor_range=15.0)
+        pf = ParticleFilter(particle_count=2000, landmarks=lmap, rng=rng)
+        pf.set_noise(0.05, 0.05, 1.0)
+        ids, z = lmap.sense(42.0, 57.0, 1.0, rng)
+        self.assertLess(len(ids), 500)
+        pf.extract_weights(z, ids)
+        best = np.argmax(pf.particles.weights)
+        self.assertLess(np.hypot(pf.particles.x[best] - 42.0, pf.particles.y[best] - 57.0), 5.0)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
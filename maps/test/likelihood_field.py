@@ -0,0 +1,79 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters import models
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.maps.likelihood_field import LikelihoodField
+from robot_localization.robot import Robot
+
+class TestLikelihoodField(unittest.TestCase):
+
+    def test_distances(self):
+        print("\n[!] LikelihoodField.distances testing..")
+        rng = np.random.default_rng(22)
+        landmarks = rng.random((10, 2)) * 100.0
+        field = LikelihoodField(landmarks, 100.0, 0.5)
+        x, y = rng.random((2, 5000)) * 100.0
+        exact = models.landmark_distances(x, y, landmarks)
+        error = np.abs(field.distances(x, y) - exact)
+        self.assertLess(error.max(), 0.5 / np.sqrt(2))
+        self.assertLess(np.median(error), 1e-3)
+        self.assertLess(np.abs(field.nearest(x, y) - exact.min(axis=1)).max(), 0.5 / np.sqrt(2))
+        self.assertEqual(field.distance_transform.shape, (201, 201))
+        self.assertTrue(np.allclose(field.nearest_log_likelihood(x, y, 10.0, 2.0),
+                                    -0.5 * ((field.nearest(x, y) - 10.0) / 2.0) ** 2
+                                    - 0.5 * np.log(2.0 * np.pi * 4.0)))
+        print("[*] Test done")
+
+    def test_log_likelihood(self):
+        print("\n[!] LikelihoodField.log_likelihood testing..")
+        rng = np.random.default_rng(23)
+        field = LikelihoodField(Robot.landmarks, 100.0, 0.25)
+        pf = ParticleFilter(2000, rng=rng, likelihood_field=field)
+        pf.set_noise(0.05, 0.05, 5.0)
+        z = [30.0, 50.0, 60.0, 40.0]
+        exact = models.log_likelihood(pf.particles.x, pf.particles.y, pf.landmarks, z, 5.0)
+        self.assertTrue(np.allclose(pf.extract_weights(z), exact - np.logaddexp.reduce(exact),
+                                    atol=0.05))
+        ids = [1, 3]
+        self.assertTrue(np.allclose(
+            field.log_likelihood(pf.particles.x, pf.particles.y, z[:2], 5.0, ids),
+            models.log_likelihood(pf.particles.x, pf.particles.y, pf.landmarks[ids], z[:2], 5.0),
+            atol=0.05))
+        with self.assertRaises(ValueError):
+            field.log_likelihood(pf.particles.x, pf.particles.y, z[:3], 5.0)
+        print("[*] Test done")
+
+    def test_distance_grids(self):
+        print("\n[!] LikelihoodField.distance_grids testing..")
+        rng = np.random.default_rng(24)
+        landmarks = rng.random((6, 2)) * 100.0
+        cached = LikelihoodField(landmarks, 100.0, 1.0)
+        uncached = LikelihoodField(landmarks, 100.0, 1.0, cache_limit=0)
+        self.assertEqual(cached.distance_grids.shape, (6, 101, 101))
+        self.assertEqual(cached.distance_grids.dtype, np.float32)
+        self.assertIs(cached.distance_grids, cached.distance_grids)
+        self.assertIsNone(uncached.distance_grids)
+        x, y = rng.random((2, 1000)) * 100.0
+        z = rng.random(6) * 50.0
+        self.assertTrue(np.allclose(cached.log_likelihood(x, y, z, 3.0),
+                                    uncached.log_likelihood(x, y, z, 3.0), atol=1e-3))
+        print("[*] Test done")
+
+    def test_memoised(self):
+        print("\n[!] LikelihoodField memoisation testing..")
+        saved = Robot.landmarks
+        try:
+            field = LikelihoodField.from_robot(1.0)
+            self.assertIs(LikelihoodField.from_robot(1.0), field)
+            Robot.set_landmarks([[10.0, 10.0]])
+            rebuilt = LikelihoodField.from_robot(1.0)
+            self.assertIsNot(rebuilt, field)
+            self.assertEqual(rebuilt.d_x2.shape, (101, 1))
+        finally:
+            Robot.set_landmarks(saved)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#pylint: disable-all
+import os
+import tempfile
+import unittest
+import numpy as np
+from robot_localization.filters.particle_set import ParticleSet
+from robot_localization.maps import storage
+from robot_localization.planning.grid import OccupancyGrid
+
+class TestStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_landmarks(self):
+        print("\n[!] Landmark storage testing..")
+        landmarks = np.random.default_rng(24).random((1000, 2)) * 100.0
+        storage.save_landmarks(self.path('map.npy'), landmarks)
+        loaded = storage.load_landmarks(self.path('map.npy'))
+        self.assertIsInstance(loaded, np.memmap)
+        self.assertTrue(np.array_equal(loaded, landmarks))
+        lmap = storage.load_landmark_map(self.path('map.npy'), sensor_range=10.0)
+        self.assertFalse(lmap.landmarks.flags.writeable)
+        self.assertEqual(len(lmap.query(50.0, 50.0)),
+                         np.sum(np.hypot(*(landmarks - 50.0).T) <= 10.0))
+        with self.assertRaises(ValueError):
+            storage.load_grid(self.path('map.npy'))
+        print("[*] Test done")
+
+    def test_grid(self):
+        print("\n[!] Grid storage testing..")
+        grid = OccupancyGrid.from_rows([[0, 1, 0], [0, 0, 1]])
+        storage.save_grid(self.path('grid.npy'), grid)
+        cells = storage.load_grid(self.path('grid.npy'))
+        self.assertEqual(cells.tolist(), [[0, 1, 0], [0, 0, 1]])
+        loaded = OccupancyGrid.from_rows(cells)
+        self.assertEqual(loaded.cells, grid.cells)
+        print("[*] Test done")
+
+    def test_particles(self):
+        print("\n[!] Particle snapshot storage testing..")
+        particles = ParticleSet.uniform(500, 100.0, np.random.default_rng(25))
+        storage.save_particles(self.path('particles.npy'), particles)
+        loaded = storage.load_particles(self.path('particles.npy'))
+        self.assertFalse(loaded.x.flags.writeable)
+        self.assertTrue(np.array_equal(loaded.orientation, particles.orientation))
+        self.assertTrue(np.array_equal(loaded.weights, particles.weights))
+        copy = loaded.copy()
+        self.assertTrue(copy.x.flags.writeable)
+        copy.x += 1.0
+        self.assertTrue(np.array_equal(loaded.x, particles.x))
+        self.assertTrue(np.array_equal(storage.load_particles(self.path('particles.npy')).x,
+                                       particles.x))
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Compact occupancy grid for the planners
+"""
+import numpy as np
+
+
+class OccupancyGrid(object):
+    """
+    Occupancy grid stored as a flat bytearray, 1 for blocked and 0 for free cells.
+    The cells are surrounded by a one cell border of blocked cells, so
+    neighbour lookups by flat index offsets never leave the grid and the
+    planners don't need any bound checks.
+    """
+
+    def __init__(self, rows, cols):
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Grid size must be greater than 0.")
+        self.rows = rows
+        self.cols = cols
+        self.stride = cols + 2
+        self.cells = bytearray(b'\x01') * ((rows + 2) * self.stride)
+        free = bytes(cols)
+        for row in range(rows):
+            start = self.index(row, 0)
+            self.cells[start:start + cols] = free
+
+    @classmethod
+    def from_rows(cls, map_):
+        """
+        Creates a grid from a list of rows (or a 2-dim array)
+        where non zero entries are blocked
+        """
+        rows, cols = len(map_), len(map_[0])
+        grid = cls(rows, cols)
+        if isinstance(map_, np.ndarray):
+            grid.to_array()[:] = map_ != 0
+            return grid
+        for row in range(rows):
+            start = grid.index(row, 0)
+            grid.cells[start:start + cols] = bytes(1 if value else 0 for value in map_[row])
+        return grid
+
+    def to_array(self):
+        """
+        Returns a (rows, cols) uint8 array view of the cells without the border,
+        writing to it changes the grid
+        """
+        cells = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows + 2, self.stride)
+        return cells[1:-1, 1:-1]
+
+    def index(self, row, col):
+        """
+        Returns the flat index of the cell at (row, col)
+        """
+        return (row + 1) * self.stride + col + 1
+
+    def position(self, index):
+        """
+        Returns the (row, col) of the cell at flat index
+        """
+        row, col = divmod(index, self.stride)
+        return (row - 1, col - 1)
+
+    def in_bounds(self, row, col):
+        """
+        Returns True if (row, col) lies inside the grid
+        """
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_blocked(self, row, col):
+        """
+        Returns True if the cell is blocked or outside of the grid
+        """
+        return not self.in_bounds(row, col) or self.cells[self.index(row, col)] != 0
+
+    def set_blocked(self, row, col, blocked=True):
+        """
+        Marks the cell as blocked or free
+        """
+        if not self.in_bounds(row, col):
+            raise ValueError('Cell out of bound')
+        self.cells[self.index(row, col)] = 1 if blocked else 0
+
+    def offsets(self, vectors):
+        """
+        Returns the flat index offsets for the given unit vectors,
+        the vector end points are read as (row, col) steps
+        """
+        return tuple(row * self.stride + col
+                     for row, col in (vector.get_end_point().get_position() for vector in vectors))
@@ -0,0 +1,192 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Incremental replanning with D* Lite
+"""
+from heapq import heappop, heappush
+from math import inf
+
+import numpy as np
+
+from robot_localization.planning.search import Search
+
+
+class DStarLite(Search):
+    """
+    D* Lite planner that keeps its search state between calls.
+    The search runs backwards from the goal, so when the robot moves
+    (set_position) or cells change (update_cells / set_map) only the
+    vertices whose cost is affected are repaired on the next plan().
+    """
+
+    def __init__(self, map_, initial_pos, cost, goal):
+        self.goal = goal
+        super().__init__(map_, initial_pos, cost)
+        self.reset()
+
+    def reset(self):
+        """
+        Drops the search state, the next plan() searches from scratch
+        """
+        grid = self.map
+        self._snapshot = bytearray(grid.cells)
+        self._target = grid.index(*self.goal)
+        self._last_start = grid.index(*self.current_position)
+        self._target_row, self._target_col = divmod(self._target, grid.stride)
+        self.km = 0
+        self.g = {}
+        self.rhs = {self._target: 0}
+        self._queued = {}
+        self._heap = []
+        self._push(self._target)
+
+    def set_goal(self, goal):
+        self.goal = goal
+        self.reset()
+
+    def set_map(self, map_):
+        """
+        Sets the map, if the size didn't change only the changed cells are repaired
+        """
+        previous = self.map
+        super().set_map(map_)
+        if previous is None or not hasattr(self, '_snapshot'):
+            return
+        if (previous.rows, previous.cols) != (self.map.rows, self.map.cols):
+            self.reset()
+            return
+        changed = np.flatnonzero(np.frombuffer(self._snapshot, dtype=np.uint8) !=
+                                 np.frombuffer(self.map.cells, dtype=np.uint8))
+        self._repair(changed.tolist())
+
+    def update_cells(self, changes):
+        """
+        Applies ((row, col), blocked) changes to the map and repairs the search
+        """
+        grid = self.map
+        for (row, col), blocked in changes:
+            grid.set_blocked(row, col, blocked)
+        self._repair([grid.index(row, col) for (row, col), _ in changes])
+
+    def _repair(self, indices):
+        self._sync_start()
+        cells = self.map.cells
+        for index in indices:
+            self._snapshot[index] = cells[index]
+        for index in indices:
+            self._update_vertex(index)
+            for offset in self.offsets:
+                self._update_vertex(index + offset)
+
+    def _heuristic(self, node, other):
+        stride = self.map.stride
+        row, col = divmod(node, stride)
+        other_row, other_col = divmod(other, stride)
+        return self.cost * (abs(row - other_row) + abs(col - other_col))
+
+    def _key(self, node):
+        best = min(self.g.get(node, inf), self.rhs.get(node, inf))
+        return (best + self._heuristic(self._last_start, node) + self.km, best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self._queued[node] = key
+        heappush(self._heap, (key, node))
+
+    def _sync_start(self):
+        start = self.map.index(*self.current_position)
+        if start != self._last_start:
+            self.km += self._heuristic(self._last_start, start)
+            self._last_start = start
+
+    def _update_vertex(self, node):
+        cells = self.map.cells
+        if node != self._target:
+            if cells[node]:
+                best = inf
+            else:
+                g = self.g
+                best = min((g.get(node + offset, inf) for offset in self.offsets
+                            if not cells[node + offset]), default=inf) + self.cost
+            self.rhs[node] = best
+        if self.g.get(node, inf) != self.rhs.get(node, inf):
+            self._push(node)
+        else:
+            self._queued.pop(node, None)
+
+    def _compute_shortest_path(self):
+        heap = self._heap
+        queued = self._queued
+        g = self.g
+        rhs = self.rhs
+        start = self._last_start
+        expansions = 0
+        while heap:
+            key, node = heap[0]
+            if queued.get(node) != key:
+                heappop(heap)
+                continue
+            if key >= self._key(start) and rhs.get(start, inf) <= g.get(start, inf):
+                break
+            heappop(heap)
+            new_key = self._key(node)
+            if key < new_key:
+                queued[node] = new_key
+                heappush(heap, (new_key, node))
+                continue
+            expansions += 1
+            if g.get(node, inf) > rhs.get(node, inf):
+                g[node] = rhs[node]
+                del queued[node]
+                for offset in self.offsets:
+                    self._update_vertex(node + offset)
+            else:
+                g[node] = inf
+                self._update_vertex(node)
+                for offset in self.offsets:
+                    self._update_vertex(node + offset)
+        self.expansions = expansions
+
+    def plan(self):
+        """
+        Returns the cheapest path from the current position to the goal as
+        a list of (row, col) positions, or None if the goal is unreachable
+        """
+        grid = self.map
+        if grid.is_blocked(*self.current_position) or grid.is_blocked(*self.goal):
+            self.expansions = 0
+            return None
+        self._sync_start()
+        self._compute_shortest_path()
+
+        g = self.g
+        cells = grid.cells
+        node = self._last_start
+        if self.rhs.get(node, inf) == inf:
+            return None
+        path = [node]
+        while node != self._target:
+            node = min((node + offset for offset in self.offsets if not cells[node + offset]),
+                       key=lambda neighbour: g.get(neighbour, inf))
+            path.append(node)
+        return [grid.position(node) for node in path]
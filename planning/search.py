@@ -23,16 +23,96 @@ SOFTWARE.
 
 Basic search algorithm for path planning
 """
+from heapq import heappop, heappush
+from math import inf
+
+from robot_localization.planning.grid import OccupancyGrid
+from robot_localization.utils.vector import DOWN, LEFT, RIGHT, UP
+
 class Search(object):
     """
+    Grid planner over a 4-connected occupancy grid.
+    map_ is an OccupancyGrid or a list of rows where non zero cells are blocked,
+    positions are (row, col) tuples and every step costs cost.
     """
+    directions = (UP, DOWN, LEFT, RIGHT)
+
     def __init__(self, map_, initial_pos, cost):
-        self.map = map_
+        self.map = None
+        self.offsets = ()
         self.current_position = initial_pos
         self.cost = cost
+        self.expansions = 0
+        self.set_map(map_)
 
     def set_map(self, map_):
+        if not isinstance(map_, OccupancyGrid):
+            map_ = OccupancyGrid.from_rows(map_)
         self.map = map_
+        self.offsets = map_.offsets(self.directions)
 
     def set_position(self, pos):
         self.current_position = pos
+
+    def a_star(self, goal):
+        """
+        Returns the cheapest path from the current position to goal as
+        a list of (row, col) positions, or None if goal is unreachable.
+        Uses the manhattan distance as heuristic.
+        """
+        return self._search(goal, True)
+
+    def dijkstra(self, goal):
+        """
+        Same as a_star but without a heuristic
+        """
+        return self._search(goal, False)
+
+    def _search(self, goal, use_heuristic):
+        grid = self.map
+        self.expansions = 0
+        if grid.is_blocked(*self.current_position) or grid.is_blocked(*goal):
+            return None
+
+        cells = grid.cells
+        stride = grid.stride
+        offsets = self.offsets
+        cost = self.cost
+        start = grid.index(*self.current_position)
+        target = grid.index(*goal)
+        target_row, target_col = divmod(target, stride)
+        weight = cost if use_heuristic else 0
+
+        costs = {start: 0}
+        parents = {start: start}
+        # ties on f are broken towards the larger g, i.e. the node closer to the goal
+        heap = [(0, 0, start)]
+        expansions = 0
+        while heap:
+            _, negative_g, node = heappop(heap)
+            g_node = -negative_g
+            if node == target:
+                break
+            if g_node > costs[node]:
+                continue
+            expansions += 1
+            g_next = g_node + cost
+            for offset in offsets:
+                neighbour = node + offset
+                if cells[neighbour] or g_next >= costs.get(neighbour, inf):
+                    continue
+                costs[neighbour] = g_next
+                parents[neighbour] = node
+                row, col = divmod(neighbour, stride)
+                estimate = weight * (abs(row - target_row) + abs(col - target_col))
+                heappush(heap, (g_next + estimate, -g_next, neighbour))
+        else:
+            self.expansions = expansions
+            return None
+
+        self.expansions = expansions
+        path = [target]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return [grid.position(node) for node in path]
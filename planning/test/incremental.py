@@ -0,0 +1,60 @@
+#pylint: disable-all
+import random
+import unittest
+from robot_localization.planning.grid import OccupancyGrid
+from robot_localization.planning.incremental import DStarLite
+from robot_localization.planning.search import Search
+
+class TestDStarLite(unittest.TestCase):
+
+    def test_matches_a_star(self):
+        print("\n[!] DStarLite replanning testing..")
+        rng = random.Random(21)
+        grid = OccupancyGrid(60, 60)
+        for _ in range(600):
+            grid.set_blocked(rng.randrange(60), rng.randrange(60))
+        grid.set_blocked(0, 0, False)
+        grid.set_blocked(59, 59, False)
+        planner = DStarLite(grid, (0, 0), 1, (59, 59))
+        reference = Search(grid, (0, 0), 1)
+
+        for step in range(30):
+            path = planner.plan()
+            expected = reference.a_star((59, 59))
+            if expected is None:
+                self.assertIsNone(path)
+                break
+            self.assertEqual(len(path), len(expected))
+            if len(path) > 1:
+                planner.set_position(path[1])
+                reference.set_position(path[1])
+            changes = []
+            for _ in range(5):
+                cell = (rng.randrange(60), rng.randrange(60))
+                if cell not in (path[1] if len(path) > 1 else path[0], (59, 59)):
+                    changes.append((cell, rng.random() < 0.7))
+            planner.update_cells(changes)
+        print("[*] Test done")
+
+    def test_incremental_is_cheaper(self):
+        print("\n[!] DStarLite incremental cost testing..")
+        map_ = [[0] * 100 for _ in range(100)]
+        planner = DStarLite(map_, (0, 0), 1, (99, 99))
+        self.assertEqual(len(planner.plan()), 199)
+        full = planner.expansions
+        map_[99][98] = 1
+        map_[98][99] = 1
+        planner.set_map(map_)
+        self.assertIsNone(planner.plan())
+        map_[98][99] = 0
+        planner.set_map(map_)
+        self.assertEqual(len(planner.plan()), 199)
+        planner.update_cells([((50, 50), True), ((10, 0), True)])
+        path = planner.plan()
+        self.assertEqual(len(path), 199)
+        self.assertLess(planner.expansions * 5, full)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+#pylint: disable-all
+import unittest
+from robot_localization.planning.grid import OccupancyGrid
+from robot_localization.planning.search import Search
+
+GRID = [[0, 0, 1, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 1, 0],
+        [0, 0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 1, 0]]
+
+class TestSearch(unittest.TestCase):
+
+    def test_grid(self):
+        print("\n[!] OccupancyGrid testing..")
+        grid = OccupancyGrid.from_rows(GRID)
+        self.assertTrue(grid.is_blocked(0, 2))
+        self.assertFalse(grid.is_blocked(0, 0))
+        self.assertTrue(grid.is_blocked(-1, 0))
+        self.assertTrue(grid.is_blocked(0, 6))
+        self.assertEqual(grid.position(grid.index(3, 4)), (3, 4))
+        grid.set_blocked(0, 0)
+        self.assertTrue(grid.is_blocked(0, 0))
+        print("[*] Test done")
+
+    def test_shortest_path(self):
+        print("\n[!] Search.a_star / Search.dijkstra testing..")
+        search = Search(GRID, (0, 0), 1)
+        for plan in (search.a_star, search.dijkstra):
+            path = plan((4, 5))
+            self.assertEqual(len(path) - 1, 11)
+            self.assertEqual(path[0], (0, 0))
+            self.assertEqual(path[-1], (4, 5))
+            for (r1, c1), (r2, c2) in zip(path, path[1:]):
+                self.assertEqual(abs(r1 - r2) + abs(c1 - c2), 1)
+                self.assertEqual(GRID[r2][c2], 0)
+        self.assertEqual(search.a_star((0, 0)), [(0, 0)])
+        print("[*] Test done")
+
+    def test_heuristic_expands_less(self):
+        print("\n[!] Search expansion testing..")
+        search = Search(OccupancyGrid(200, 200), (0, 0), 1)
+        self.assertEqual(len(search.a_star((150, 180))), 331)
+        a_star = search.expansions
+        search.dijkstra((150, 180))
+        self.assertLess(a_star * 10, search.expansions)
+        print("[*] Test done")
+
+    def test_unreachable(self):
+        print("\n[!] Search unreachable goal testing..")
+        search = Search(GRID, (0, 0), 1)
+        self.assertIsNone(search.a_star((0, 2)))
+        search.set_map([[0, 1, 0]])
+        self.assertIsNone(search.dijkstra((0, 2)))
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,15 +26,114 @@ SOFTWARE.
 import random
 from collections import Counter
 
-class ResamplingWheel(object):
+import numpy as np
+
+from robot_localization.utils.rng import make_rng
+
+class Resampler(object):
+    """
+    A Resampler interface to pick a whole new generation of particles at once.
+    Implementations return an array of indices into the given weights.
+    """
+
+    def resample(self, weights, count=None, rng=None):
+        """
+        Returns count indices picked according to weights.
+        count defaults to the number of weights.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _prepare(weights, count, rng):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError("Weights need to be a non-empty 1-dim sequence.")
+        if not weights.sum() > 0.0:
+            raise ValueError("Weights must sum up to a positive value.")
+        if count is None:
+            count = len(weights)
+        return weights, int(count), make_rng(rng)
+
+    @staticmethod
+    def _cumulative(weights):
+        cumulative = np.cumsum(weights)
+        cumulative /= cumulative[-1]
+        cumulative[-1] = 1.0
+        return cumulative
+
+    @staticmethod
+    def _search(cumulative, positions):
+        indices = np.searchsorted(cumulative, positions, side='right')
+        return np.minimum(indices, len(cumulative) - 1, out=indices)
+
+
+class MultinomialResampler(Resampler):
+    """
+    Draws every index independently from the cumulative weights
+    """
+
+    def resample(self, weights, count=None, rng=None):
+        weights, count, rng = self._prepare(weights, count, rng)
+        return self._search(self._cumulative(weights), rng.random(count))
+
+
+class StratifiedResampler(Resampler):
+    """
+    Splits [0, 1) into count equal strata and draws one position from each stratum
+    """
+
+    def resample(self, weights, count=None, rng=None):
+        weights, count, rng = self._prepare(weights, count, rng)
+        positions = rng.random(count)
+        positions += np.arange(count)
+        positions /= count
+        return self._search(self._cumulative(weights), positions)
+
+
+class SystematicResampler(Resampler):
+    """
+    Like stratified resampling but uses one random offset for every stratum,
+    the vectorized counterpart of the resampling wheel
+    """
+
+    def resample(self, weights, count=None, rng=None):
+        weights, count, rng = self._prepare(weights, count, rng)
+        positions = np.arange(count, dtype=np.float64)
+        positions += rng.random()
+        positions /= count
+        return self._search(self._cumulative(weights), positions)
+
+
+class ResidualResampler(Resampler):
+    """
+    Copies every particle floor(count * weight) times and draws
+    the remaining ones with multinomial resampling over the residuals
+    """
+
+    def resample(self, weights, count=None, rng=None):
+        weights, count, rng = self._prepare(weights, count, rng)
+        scaled = weights * (count / weights.sum())
+        copies = np.floor(scaled).astype(np.intp)
+        indices = np.repeat(np.arange(len(weights)), copies)
+        remaining = count - len(indices)
+        if remaining > 0:
+            scaled -= copies
+            residuals = MultinomialResampler().resample(scaled, remaining, rng)
+            indices = np.concatenate((indices, residuals))
+        return indices[:count]
+
+
+class ResamplingWheel(Resampler):
     """
     A Class implementation for resampling wheel
     Creates an imaginary wheel that consist of weighted portions.
     According to these weights, you can pick an index value.
     Index with more weights has more chance to be picked up.
+    Draws from the global random module unless a Generator is given as rng.
     """
 
-    def __init__(self, initiate_with=None):
+    def __init__(self, initiate_with=None, rng=None):
+        self.rng = None if rng is None else make_rng(rng)
         self.wheel = []
         self.max_weight = None
         self.is_resampled = False
@@ -48,7 +147,15 @@ class ResamplingWheel(object):
 
         if self.length > 0:
             self.max_weight = max(self.wheel)
-            self.last_index = int(random.random() * self.length)
+            self.last_index = int(self._uniform(1)[0] * self.length)
+
+    def _uniform(self, count):
+        """
+        Returns count uniform values in [0, 1) drawn with a single call
+        """
+        if self.rng is None:
+            return [random.random() for _ in range(count)]
+        return self.rng.random(count).tolist()
 
     def set_wheel_data(self, data):
         """
@@ -64,7 +171,7 @@ class ResamplingWheel(object):
 
         if self.length > 0:
             self.max_weight = max(self.wheel)
-            self.last_index = int(random.random() * self.length)
+            self.last_index = int(self._uniform(1)[0] * self.length)
 
     def get_pick_index(self):
         """
@@ -83,9 +190,34 @@ class ResamplingWheel(object):
 
         return self.last_index
 
+    def resample(self, weights, count=None, rng=None):
+        """
+        Returns count indices picked by spinning the wheel over weights.
+        Walks the wheel one index at a time, kept for comparison with the
+        vectorized resamplers. A given rng becomes the wheel's random source.
+        """
+        if rng is not None:
+            self.rng = make_rng(rng)
+        self.set_wheel_data(list(weights))
+        if count is None:
+            count = self.length
+
+        wheel, length, index = self.wheel, self.length, self.last_index
+        spin = 2.0 * self.max_weight
+        indices = np.empty(count, dtype=np.intp)
+        beta = 0.0
+        for i, value in enumerate(self._uniform(count)):
+            beta += value * spin
+            while beta > wheel[index]:
+                beta -= wheel[index]
+                index = (index + 1) % length
+            indices[i] = index
+        self.beta, self.last_index = beta, index
+        return indices
+
     def __resample__(self):
 
-        self.beta += random.random() * 2.0 * self.max_weight
+        self.beta += self._uniform(1)[0] * 2.0 * self.max_weight
         self.is_resampled = True
 
     def __len__(self):
@@ -25,20 +25,33 @@ SOFTWARE.
 """
 import random
 from math import pi, exp, sqrt, cos, sin
-from resampling import ResamplingWheel
+import numpy as np
+from robot_localization.filters.estimation import wrapped_error
+from robot_localization.utils.rng import make_rng
+from robot_localization.resampling import ResamplingWheel
 
 class Robot(object):
     """
     The class that helps to simulate the robot behaviours
     Sebastian Thrun's Robot implementation used as reference and improved by Talha Havadar.
+    Uses the global random module unless a NumPy Generator is given as rng,
+    moved robots share the rng of the robot they were moved from.
     """
     world_size = 100.0
     landmarks  = [[20.0, 20.0], [80.0, 80.0], [20.0, 80.0], [80.0, 20.0]]
-
-    def __init__(self):
-        self.x = random.random() * Robot.world_size
-        self.y = random.random() * Robot.world_size
-        self.orientation = random.random() * 2.0 * pi
+    map_version = 0
+
+    def __init__(self, rng=None):
+        self.rng = None if rng is None else make_rng(rng)
+        if self.rng is None:
+            self.x = random.random() * Robot.world_size
+            self.y = random.random() * Robot.world_size
+            self.orientation = random.random() * 2.0 * pi
+        else:
+            x, y, orientation = self.rng.random(3).tolist()
+            self.x = x * Robot.world_size
+            self.y = y * Robot.world_size
+            self.orientation = orientation * 2.0 * pi
         self.forward_noise = 0.0
         self.turn_noise = 0.0
         self.sense_noise = 0.0
@@ -51,6 +64,7 @@ class Robot(object):
         if size < 0:
             raise ValueError("World size must be greater than 0.")
         Robot.world_size = size
+        Robot.map_version += 1
 
     @staticmethod
     def set_landmarks(lmarks):
@@ -61,6 +75,7 @@ class Robot(object):
         if size <= 0 and isinstance(lmarks, list):
             raise ValueError("Landmarks size needs to be greater than zero and needs to be a list.")
         Robot.landmarks = lmarks
+        Robot.map_version += 1
 
     def set(self, new_x, new_y, new_orientation):
         """
@@ -91,10 +106,14 @@ class Robot(object):
         Simulates the sensor behaviour and
         returns the measurement according to landmarks
         """
+        if self.rng is None:
+            noise = [random.gauss(0.0, self.sense_noise) for _ in range(len(Robot.landmarks))]
+        else:
+            noise = self.rng.normal(0.0, self.sense_noise, len(Robot.landmarks)).tolist()
         z_vals = []
         for i in range(len(Robot.landmarks)):
             dist = sqrt((self.x - Robot.landmarks[i][0]) ** 2 + (self.y - Robot.landmarks[i][1]) ** 2)
-            dist += random.gauss(0.0, self.sense_noise)
+            dist += noise[i]
             z_vals.append(dist)
         return z_vals
 
@@ -103,21 +122,31 @@ class Robot(object):
         if forward < 0:
             raise ValueError('Robot cant move backwards')
         
+        if self.rng is None:
+            turn_noise = random.gauss(0.0, self.turn_noise)
+            forward_noise = random.gauss(0.0, self.forward_noise)
+        else:
+            turn_noise, forward_noise = self.rng.normal(
+                0.0, (self.turn_noise, self.forward_noise)).tolist()
+
         # turn, and add randomness to the turning command
-        orientation = self.orientation + float(turn) + random.gauss(0.0, self.turn_noise)
+        orientation = self.orientation + float(turn) + turn_noise
         orientation %= 2 * pi
 
         # move, and add randomness to the motion command
-        dist = float(forward) + random.gauss(0.0, self.forward_noise)
+        dist = float(forward) + forward_noise
         x = self.x + (cos(orientation) * dist)
         y = self.y + (sin(orientation) * dist)
         x %= Robot.world_size    # cyclic truncate
         y %= Robot.world_size
 
-        # set particle
-        res = Robot()
-        res.set(x, y, orientation)
-        res.set_noise(self.forward_noise, self.turn_noise, self.sense_noise)
+        # set particle, without drawing a random pose that is overwritten anyway
+        res = Robot.__new__(Robot)
+        res.rng = self.rng
+        res.x, res.y, res.orientation = x, y, orientation
+        res.forward_noise = self.forward_noise
+        res.turn_noise = self.turn_noise
+        res.sense_noise = self.sense_noise
         return res
 
     @staticmethod
@@ -146,17 +175,16 @@ class Robot(object):
 
 def eval(r, p):
     """
-    Calculates the sum of square error for the robot and particles
+    Calculates the mean error of the particles to the robot in the cyclic world.
+    p is either a list of Robot instances or a ParticleSet.
     """
-    sum = 0.0
-
-    for r_particle in p: # calculate mean error
-        d_x = (r_particle.x - r.x + (Robot.world_size/2.0)) % Robot.world_size - (Robot.world_size/2.0)
-        d_y = (r_particle.y - r.y + (Robot.world_size/2.0)) % Robot.world_size - (Robot.world_size/2.0)
-        err = sqrt(d_x * d_x + d_y * d_y)
-        sum += err
+    if isinstance(p, list):
+        x = np.fromiter((r_particle.x for r_particle in p), dtype=np.float64, count=len(p))
+        y = np.fromiter((r_particle.y for r_particle in p), dtype=np.float64, count=len(p))
+    else:
+        x, y = p.x, p.y
 
-    return sum / float(len(p))
+    return wrapped_error(x, y, r.x, r.y, Robot.world_size)
 
 if __name__ == "__main__":
     from pprint import pprint as pp
@@ -0,0 +1,40 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.resampling import (MultinomialResampler, ResamplingWheel,
+                                           ResidualResampler, StratifiedResampler,
+                                           SystematicResampler)
+
+class TestResampling(unittest.TestCase):
+
+    def test_resamplers(self):
+        print("\n[!] Resampler testing..")
+        weights = np.array([5.0, 2.0, 1.0, 1.0, 1.0])
+        expected = weights / weights.sum()
+        for resampler in (MultinomialResampler(), StratifiedResampler(),
+                          SystematicResampler(), ResidualResampler(), ResamplingWheel()):
+            indices = resampler.resample(weights, 20000, np.random.default_rng(7))
+            self.assertEqual(len(indices), 20000)
+            counts = np.bincount(indices, minlength=5) / 20000.0
+            self.assertTrue(np.allclose(counts, expected, atol=0.02), type(resampler).__name__)
+        print("[*] Test done")
+
+    def test_low_variance(self):
+        print("\n[!] Systematic and residual copy count testing..")
+        weights = np.array([0.5, 0.25, 0.125, 0.125])
+        for resampler in (SystematicResampler(), ResidualResampler()):
+            indices = resampler.resample(weights, 8, np.random.default_rng(8))
+            self.assertEqual(np.bincount(indices, minlength=4).tolist(), [4, 2, 1, 1])
+        print("[*] Test done")
+
+    def test_invalid_weights(self):
+        print("\n[!] Resampler invalid weight testing..")
+        with self.assertRaises(ValueError):
+            SystematicResampler().resample([0.0, 0.0])
+        with self.assertRaises(ValueError):
+            MultinomialResampler().resample([])
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,8 +22,6 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from robot_localization.utils.vector import Vector2D
-
 REPR_3D = 0
 REPR_2D = 1
 REPR_UNKNOWN = -1
@@ -33,6 +31,13 @@ class Point(object):
     A Point interface to provide essential functionalities
     and modularity to module
     """
+    __slots__ = ()
+
+    def copy(self):
+        """
+        Returns a new point with the same coordinates
+        """
+        return self.__class__(*self.get_position())
 
     def get_position(self):
         """
@@ -81,15 +86,16 @@ class Point2D(Point):
     """
     A representation of Point interface with 2 axis
     """
+    __slots__ = ('x_axis', 'y_axis')
+
     def __init__(self, x_, y_):
-        super().__init__()
         self.x_axis = x_
         self.y_axis = y_
 
     def __eq__(self, other):
         """Overrides the default behaviour"""
-        if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+        if other.__class__ is self.__class__:
+            return self.x_axis == other.x_axis and self.y_axis == other.y_axis
         else:
             return False
 
@@ -131,14 +137,18 @@ class Point3D(Point2D):
     """
     A representation of Point interface with 3 axis
     """
+    __slots__ = ('z_axis',)
+
     def __init__(self, x_, y_, z_):
-        super().__init__(x_, y_)
+        self.x_axis = x_
+        self.y_axis = y_
         self.z_axis = z_
 
     def __eq__(self, other):
         """Overrides the default behaviour"""
-        if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+        if other.__class__ is self.__class__:
+            return (self.x_axis == other.x_axis and self.y_axis == other.y_axis
+                    and self.z_axis == other.z_axis)
         else:
             return False
 
@@ -166,20 +176,33 @@ class Point3D(Point2D):
 
 class Pose(object):
     """
-    Holds the position and the orientation of the robot
+    Holds the position and the orientation of the robot.
+    The position is shared with the caller until the first move, which
+    copies it once, so moving never changes a point owned by someone else.
     """
+    __slots__ = ('position', 'orientation', '_owns_position')
+
     def __init__(self, position: Point, orientation):
         self.position = position
         self.orientation = orientation
+        self._owns_position = False
 
 
-    def move(self, vector: Vector2D):
+    def move(self, vector: 'Vector2D'):
+        """
+        Moves the position by the vector in place. A position still shared
+        with the caller is copied first, later moves create no new point.
+        The vector must start at the origin.
+        """
         if self.get_representation_type() == REPR_2D:
-            assert isinstance(vector, Vector2D)
-            assert vector.start_point.get_position() == (0, 0)
-            e_xy = vector.end_point.get_position()
-            new_xy = tuple(map(sum, zip(e_xy, self.get_position())))
-            self.set_position(Point2D(*new_xy))
+            assert isinstance(vector, _vector.Vector2D)
+            if not self._owns_position:
+                self.position = self.position.copy()
+                self._owns_position = True
+            start, end = vector.start_point, vector.end_point
+            assert start.x_axis == 0 and start.y_axis == 0
+            self.position.x_axis += end.x_axis
+            self.position.y_axis += end.y_axis
         else:
             raise NotImplementedError
 
@@ -191,9 +214,10 @@ class Pose(object):
 
     def set_position(self, position: Point):
         """
-        Sets the position
+        Sets the position, it is copied on the next move
         """
         self.position = position
+        self._owns_position = False
 
     def get_position(self):
         """
@@ -218,3 +242,8 @@ class Pose(object):
             return REPR_2D
         else:
             return REPR_UNKNOWN
+
+
+# imported last since utils.vector depends on this module, Pose.move looks
+# Vector2D up on the module so the import order doesn't matter
+import robot_localization.utils.vector as _vector
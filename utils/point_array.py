@@ -0,0 +1,174 @@
+"""
+MIT License
+
+Copyright (c) 2017 Talha Can Havadar
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+import numpy as np
+
+from robot_localization.utils.point import Point2D, Point3D, Pose
+from robot_localization.utils.vector import Vector2D
+
+class PointArray(object):
+    """
+    Holds many 2D or 3D points in one (N, 2) or (N, 3) float64 NumPy buffer.
+    Operations work on every point at once. Comparing two arrays with ==
+    gives one bool per point, like NumPy does.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        data = np.array(data, dtype=np.float64, ndmin=2)
+        if data.ndim != 2 or data.shape[1] not in (2, 3):
+            raise ValueError("Points must be given as (N, 2) or (N, 3) values.")
+        self.data = data
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Creates the array from a list of Point2D or Point3D instances
+        """
+        return cls([point.get_position() for point in points])
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        """
+        Returns the point at index as a Point2D or Point3D instance,
+        a slice or an index array gives a new PointArray
+        """
+        data = self.data[index]
+        if data.ndim == 2:
+            return PointArray(data)
+        if self.data.shape[1] == 2:
+            return Point2D(*data.tolist())
+        return Point3D(*data.tolist())
+
+    def __eq__(self, other):
+        """Compares point by point"""
+        if isinstance(other, PointArray):
+            other = other.data
+        elif isinstance(other, Point2D):
+            other = other.get_position()
+        return np.all(self.data == other, axis=1)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    __hash__ = None
+
+    def get_x_axis(self):
+        """
+        Returns the x axis of every point
+        """
+        return self.data[:, 0]
+
+    def get_y_axis(self):
+        """
+        Returns the y axis of every point
+        """
+        return self.data[:, 1]
+
+    def get_z_axis(self):
+        """
+        Returns the z axis of every point
+        """
+        if self.data.shape[1] != 3:
+            raise NotImplementedError
+        return self.data[:, 2]
+
+    def move(self, offsets):
+        """
+        Moves every point in place by offsets, which is a Vector2D starting
+        at the origin, one offset for all points or one offset per point
+        """
+        if isinstance(offsets, Vector2D):
+            start, end = offsets.start_point, offsets.end_point
+            offsets = (end.x_axis - start.x_axis, end.y_axis - start.y_axis)
+        offsets = np.asarray(offsets, dtype=np.float64)
+        self.data[:, :offsets.shape[-1]] += offsets
+
+    def get_magnitude(self):
+        """
+        Returns the distance of every point to the origin,
+        the magnitude of the vectors from the origin to the points
+        """
+        return np.sqrt(np.einsum('ij,ij->i', self.data, self.data))
+
+
+class PoseArray(object):
+    """
+    Holds many poses as a PointArray of positions and an array of orientations
+    """
+    __slots__ = ('positions', 'orientations')
+
+    def __init__(self, positions, orientations):
+        if not isinstance(positions, PointArray):
+            positions = PointArray(positions)
+        self.positions = positions
+        self.orientations = np.array(orientations, dtype=np.float64, ndmin=1)
+        if self.orientations.shape != (len(positions),):
+            raise ValueError("Every position needs an orientation.")
+
+    @classmethod
+    def from_poses(cls, poses):
+        """
+        Creates the array from a list of Pose instances
+        """
+        return cls([pose.get_position() for pose in poses],
+                   [pose.get_orientation() for pose in poses])
+
+    def __len__(self):
+        return len(self.orientations)
+
+    def __getitem__(self, index):
+        """
+        Returns the pose at index as a Pose instance,
+        a slice or an index array gives a new PoseArray
+        """
+        orientations = self.orientations[index]
+        if np.ndim(orientations) == 1:
+            return PoseArray(self.positions[index], orientations)
+        return Pose(self.positions[index], float(orientations))
+
+    def __eq__(self, other):
+        """Compares pose by pose"""
+        if not isinstance(other, PoseArray):
+            return NotImplemented
+        return (self.positions == other.positions) & (self.orientations == other.orientations)
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    __hash__ = None
+
+    def move(self, offsets):
+        """
+        Moves every position in place, see PointArray.move
+        """
+        self.positions.move(offsets)
+
+    def get_magnitude(self):
+        """
+        Returns the distance of every position to the origin
+        """
+        return self.positions.get_magnitude()
@@ -1,6 +1,7 @@
 #pylint: disable-all
 import unittest
-from robot_localization.utils.point import Point2D, Point3D
+from robot_localization.utils.point import Point2D, Point3D, Pose
+from robot_localization.utils.vector import Vector2D, UP, DOWN, RIGHT
 
 class TestPoint(unittest.TestCase):
 
@@ -31,6 +32,44 @@ class TestPoint(unittest.TestCase):
         self.assertEqual(p.get_position(), (0, 0, 0))
         print("[*] Test done")
 
+    def test_slots(self):
+        print("\n[!] Point slots testing..")
+        for obj in (Point2D(1, 2), Point3D(1, 2, 3), Pose(Point2D(0, 0), 0), UP):
+            self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertEqual(Point2D(1, 2), Point2D(1, 2))
+        self.assertNotEqual(Point2D(1, 2), Point2D(2, 1))
+        self.assertNotEqual(Point2D(1, 2), Point3D(1, 2, 0))
+        self.assertEqual(Point3D(1, 2, 3), Point3D(1, 2, 3))
+        print("[*] Test done")
+
+    def test_Pose_move(self):
+        print("\n[!] Pose.move testing..")
+        pose = Pose(Point2D(2, 3), 0.5)
+        pose.move(UP)
+        position = pose.position
+        pose.move(RIGHT)
+        self.assertEqual(pose.get_position(), (3, 4))
+        self.assertIs(pose.position, position)
+        self.assertEqual(Vector2D(Point2D(1, 1), Point2D(4, 5)).get_magnitude(), 5.0)
+        with self.assertRaises(NotImplementedError):
+            Pose(Point3D(0, 0, 0), 0).move(UP)
+        print("[*] Test done")
+
+    def test_Pose_move_shared_point(self):
+        print("\n[!] Pose.move shared point testing..")
+        shared = Point2D(1, 1)
+        first, second = Pose(shared, 0), Pose(shared, 0)
+        first.move(UP)
+        self.assertEqual(shared, Point2D(1, 1))
+        self.assertEqual(second.get_position(), (1, 1))
+        second.set_position(shared)
+        second.move(RIGHT)
+        self.assertEqual(shared, Point2D(1, 1))
+        Pose(DOWN.get_start_point(), 0).move(RIGHT)
+        self.assertEqual(UP.start_point, Point2D(0, 0))
+        self.assertEqual(UP.get_magnitude(), 1.0)
+        print("[*] Test done")
+
 
 if __name__ == '__main__':
     unittest.main()
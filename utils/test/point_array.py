@@ -0,0 +1,55 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.utils.point import Point2D, Point3D, Pose
+from robot_localization.utils.point_array import PointArray, PoseArray
+from robot_localization.utils.vector import UP, RIGHT
+
+class TestPointArray(unittest.TestCase):
+
+    def test_PointArray(self):
+        print("\n[!] PointArray testing..")
+        points = PointArray.from_points([Point2D(3, 4), Point2D(0, 1), Point2D(6, 8)])
+        self.assertEqual(len(points), 3)
+        self.assertEqual(points[2], Point2D(6.0, 8.0))
+        self.assertEqual(points.get_magnitude().tolist(), [5.0, 1.0, 10.0])
+        points.move(UP)
+        self.assertEqual(points.get_x_axis().tolist(), [4.0, 1.0, 7.0])
+        points.move([[0, 1], [0, 2], [0, 3]])
+        self.assertEqual(points.get_y_axis().tolist(), [5.0, 3.0, 11.0])
+        self.assertEqual((points == Point2D(1.0, 3.0)).tolist(), [False, True, False])
+        self.assertEqual((points == PointArray(points.data.copy())).tolist(), [True] * 3)
+        with self.assertRaises(NotImplementedError):
+            points.get_z_axis()
+        cube = PointArray.from_points([Point3D(1, 2, 2)])
+        self.assertEqual(cube.get_magnitude().tolist(), [3.0])
+        self.assertEqual(cube[0], Point3D(1.0, 2.0, 2.0))
+        head = points[:2]
+        self.assertIsInstance(head, PointArray)
+        self.assertEqual(head.get_x_axis().tolist(), [4.0, 1.0])
+        head.move(UP)
+        self.assertEqual(points.get_x_axis().tolist(), [4.0, 1.0, 7.0])
+        self.assertEqual(points[[2, 0]][0], Point2D(7.0, 11.0))
+        print("[*] Test done")
+
+    def test_PoseArray(self):
+        print("\n[!] PoseArray testing..")
+        poses = PoseArray.from_poses([Pose(Point2D(0, 0), 0.1), Pose(Point2D(1, 1), 0.2)])
+        poses.move(RIGHT)
+        self.assertEqual(poses[1].get_position(), (1.0, 2.0))
+        self.assertEqual(poses[1].get_orientation(), 0.2)
+        tail = poses[1:]
+        self.assertIsInstance(tail, PoseArray)
+        self.assertEqual(len(tail), 1)
+        self.assertEqual(tail[0].get_position(), (1.0, 2.0))
+        pose = poses[0]
+        pose.move(UP)
+        self.assertEqual(poses[0].get_position(), (0.0, 1.0))
+        other = PoseArray(poses.positions.data.copy(), [0.1, 0.3])
+        self.assertEqual((poses == other).tolist(), [True, False])
+        self.assertTrue(np.allclose(poses.get_magnitude(), [1.0, np.sqrt(5)]))
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#pylint: disable-all
+import unittest
+import numpy as np
+from robot_localization.filters.particle_filter import ParticleFilter
+from robot_localization.resampling import ResamplingWheel
+from robot_localization.robot import Robot
+from robot_localization.utils.rng import make_rng, spawn
+
+class TestRng(unittest.TestCase):
+
+    def test_make_rng(self):
+        print("\n[!] make_rng / spawn testing..")
+        rng = np.random.default_rng(1)
+        self.assertIs(make_rng(rng), rng)
+        self.assertEqual(make_rng(5).random(), make_rng(5).random())
+        first, second = spawn(7, 2)
+        self.assertNotEqual(first.random(), second.random())
+        self.assertEqual([r.random() for r in spawn(7, 2)], [r.random() for r in spawn(7, 2)])
+        print("[*] Test done")
+
+    def test_reproducible_components(self):
+        print("\n[!] Seeded component testing..")
+        def run(seed):
+            robot = Robot(seed)
+            robot.set_noise(0.05, 0.05, 5.0)
+            robot = robot.move(0.1, 5.0)
+            z = robot.sense()
+            pf = ParticleFilter(100, rng=robot.rng)
+            pf.set_noise(0.05, 0.05, 5.0)
+            pf.filter(0.1, 5.0, z)
+            picks = ResamplingWheel(rng=robot.rng).resample(pf.particles.weights, 50)
+            return z, pf.particles.x, picks
+        a, b = run(8), run(8)
+        self.assertEqual(a[0], b[0])
+        self.assertTrue(np.array_equal(a[1], b[1]))
+        self.assertTrue(np.array_equal(a[2], b[2]))
+        self.assertFalse(np.array_equal(run(9)[1], a[1]))
+        print("[*] Test done")
+
+    def test_move_draws(self):
+        print("\n[!] Robot.move draw count testing..")
+        robot = Robot(np.random.default_rng(10))
+        robot.set_noise(0.05, 0.05, 5.0)
+        for _ in range(5):
+            robot = robot.move(0.1, 5.0)
+        # the initial pose and the motion noise, nothing for the moved copies
+        expected = np.random.default_rng(10)
+        expected.random(3)
+        for _ in range(5):
+            expected.normal(0.0, (0.05, 0.05))
+        self.assertEqual(robot.rng.random(), expected.random())
+        self.assertEqual(robot.forward_noise, 0.05)
+        print("[*] Test done")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,13 +23,14 @@ SOFTWARE.
 """
 
 from robot_localization.utils.point import Point2D, Point
-from math import sqrt
+from math import hypot
 
 class Vector(object):
     """
     A Vector interface to provide essential functionalities
     and modularity to module
     """
+    __slots__ = ()
 
     def get_start_point(self) -> Point:
         """
@@ -49,7 +50,11 @@ class Vector(object):
         """
         raise NotImplementedError
 
-class Vector2D(object):
+class Vector2D(Vector):
+    """
+    A representation of Vector interface between two Point2D instances
+    """
+    __slots__ = ('start_point', 'end_point')
 
     def __init__(self, start_point=Point2D(0, 0), end_point=Point2D(0, 0)):
         self.start_point = start_point
@@ -71,9 +76,8 @@ class Vector2D(object):
         """
         Returns the magnitude of the vector
         """
-        x_1, y_1 = self.get_start_point().get_position()
-        x_2, y_2 = self.get_end_point().get_position()
-        return sqrt(((x_2 - x_1) ** 2) + ((y_2 - y_1) ** 2))
+        start, end = self.start_point, self.end_point
+        return hypot(end.x_axis - start.x_axis, end.y_axis - start.y_axis)
 
 UP = Vector2D(end_point=Point2D(1, 0))
 DOWN = Vector2D(end_point=Point2D(-1, 0))